@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark del bloqueo de peticiones y la caché en disco de Chrome
+Uso: python3 benchmarks/bench_blocking.py --league spain --season 2025-2026 [--matches 10]
+
+Carga los mismos partidos (los primeros --matches de match_urls) con cuatro
+configuraciones de Chrome y muestra, por partido, los bytes transferidos, el
+número de peticiones (y bloqueadas) y el tiempo hasta que la página está lista
+(wait_for_match_page):
+
+  antes             los flags de Chrome de antes (BASELINE_CHROME_ARGS: solo sin
+                    imágenes), sin bloqueo
+  perfil ligero     CHROME_ARGS (sin extensiones, tráfico de fondo, sync...), sin bloqueo
+  bloqueo           lo anterior con BLOCKING_DEFAULTS (imágenes, fuentes, media,
+                    publicidad/analítica)
+  bloqueo + caché   lo anterior con caché HTTP en disco (la del primer partido
+                    se llena; en los siguientes los bundles JS salen de la caché)
+
+Los bytes se cuentan con el log de red de Chrome (encodedDataLength de cada
+respuesta), así que incluyen las peticiones a otros dominios.
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+
+# Flags con los que setup_driver arrancaba Chrome antes del perfil ligero
+BASELINE_CHROME_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    "--blink-settings=imagesEnabled=false",
+]
+
+
+def network_totals(driver):
+    """(bytes, peticiones, bloqueadas) desde la última lectura del log de red"""
+    total_bytes = requests = blocked = 0
+    for entry in driver.get_log('performance'):
+        event = json.loads(entry['message'])['message']
+        params = event.get('params', {})
+        if event.get('method') == 'Network.requestWillBeSent':
+            requests += 1
+        elif event.get('method') == 'Network.loadingFinished':
+            total_bytes += params.get('encodedDataLength', 0)
+        elif event.get('method') == 'Network.loadingFailed' and params.get('blockedReason'):
+            blocked += 1
+    return total_bytes, requests, blocked
+
+
+def run_config(urls, chrome_args, blocking, cache_dir):
+    lean_args = scraper.CHROME_ARGS
+    scraper.CHROME_ARGS = chrome_args
+    try:
+        driver = scraper.setup_driver(capture_network=True, blocking=blocking, cache_dir=cache_dir)
+    finally:
+        scraper.CHROME_ARGS = lean_args
+    results = []
+    try:
+        for url in urls:
+            driver.get_log('performance')
+            start = time.perf_counter()
+            try:
+                scraper.wait_for_match_page(driver, url)
+            except Exception as e:
+                print(f"   ⚠️ {scraper.match_id_from_url(url)}: {e}")
+                continue
+            ready = time.perf_counter() - start
+            results.append((ready, *network_totals(driver)))
+    finally:
+        driver.quit()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de bloqueo de peticiones y caché de Chrome')
+    parser.add_argument('--league', default='spain', choices=scraper.ALL_LEAGUES)
+    parser.add_argument('--season', type=scraper.normalize_season, default=None)
+    parser.add_argument('--matches', type=int, default=10, help='Partidos a cargar con cada configuración')
+    args = parser.parse_args()
+
+    season = args.season or scraper.current_season()
+    urls = scraper.read_match_urls(scraper.opta_urls_path(args.league, season))[:args.matches]
+    if not urls:
+        sys.exit(f"❌ No hay URLs de {args.league} {season}: ejecuta antes scraper.py urls")
+
+    scraper.set_readiness(None)
+    cache_dir = tempfile.mkdtemp(prefix='bench_chrome_cache_')
+    configs = [
+        ('antes', BASELINE_CHROME_ARGS, None, None),
+        ('perfil ligero', scraper.CHROME_ARGS, None, None),
+        ('bloqueo', scraper.CHROME_ARGS, scraper.BLOCKING_DEFAULTS, None),
+        ('bloqueo + caché', scraper.CHROME_ARGS, scraper.BLOCKING_DEFAULTS, cache_dir),
+    ]
+    print(f"{args.league} {season}: {len(urls)} partidos por configuración\n")
+    print(f"{'configuración':18} {'KB/partido':>11} {'peticiones':>11} {'bloqueadas':>11} {'lista (s)':>10}")
+    try:
+        for name, chrome_args, blocking, cache in configs:
+            results = run_config(urls, chrome_args, blocking, cache)
+            if not results:
+                print(f"{name:18} sin partidos cargados")
+                continue
+            n = len(results)
+            print(f"{name:18} {sum(r[1] for r in results) / n / 1024:11.0f} "
+                  f"{sum(r[2] for r in results) / n:11.1f} {sum(r[3] for r in results) / n:11.1f} "
+                  f"{sum(r[0] for r in results) / n:10.2f}")
+    finally:
+        shutil.rmtree(cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
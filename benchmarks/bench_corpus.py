@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Benchmark offline del parseo de partidos con el corpus de páginas guardadas
+Uso: python3 benchmarks/bench_corpus.py [--repeat 5] [--parser bs4]
+     python3 benchmarks/bench_corpus.py --update-golden
+     python3 benchmarks/bench_corpus.py --record spain --season 2025-2026 --ids <id>,<id> --case "..."
+
+benchmarks/corpus contiene páginas de partidos ya renderizadas
+(pages/<id>.html.gz), su índice (index.json: liga, URL, Aux y el caso que cubre
+cada página: liga, eliminatoria de UCL, tablas duplicadas, nombres de equipo
+por las estrategias 2-4...) y las filas esperadas de cada una (golden/<id>.json).
+
+Cada página pasa por el mismo camino que en scraper.py: load_match_page con un
+driver falso que sirve el HTML guardado (sin red ni Chrome) y parse_match_page
+con cada backend. Se muestra el ritmo (páginas/s), el pico de memoria de Python
+durante una pasada (tracemalloc; la memoria de libxml2 del backend lxml no se
+ve ahí, solo en el RSS máximo del proceso) y si las filas coinciden con las
+esperadas (sale con código 1 si alguna difiere).
+
+--update-golden reescribe las filas esperadas con el resultado actual de bs4:
+solo después de comprobar que el cambio en las filas es intencionado.
+--record añade al corpus páginas del archivo raw (--archive-raw) de una liga.
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import time
+import argparse
+import resource
+import tracemalloc
+
+from selenium.common.exceptions import NoSuchElementException
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus')
+INDEX_FILE = os.path.join(CORPUS_DIR, 'index.json')
+
+
+def page_path(match_id):
+    return os.path.join(CORPUS_DIR, 'pages', f"{match_id}.html.gz")
+
+
+def golden_path(match_id):
+    return os.path.join(CORPUS_DIR, 'golden', f"{match_id}.json")
+
+
+def load_index():
+    if not os.path.exists(INDEX_FILE):
+        return []
+    with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_json(path, data):
+    scraper.ensure_parent_dir(path)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def load_page(match_id):
+    with open(page_path(match_id), 'rb') as f:
+        return gzip.decompress(f.read()).decode('utf-8')
+
+
+def save_page(match_id, html):
+    scraper.ensure_parent_dir(page_path(match_id))
+    with open(page_path(match_id), 'wb') as f:
+        f.write(gzip.compress(html.encode('utf-8'), mtime=0))
+
+
+def load_golden(match_id):
+    if not os.path.exists(golden_path(match_id)):
+        return None
+    with open(golden_path(match_id), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class FakeElement:
+    def __init__(self, text):
+        self.text = text
+
+
+class CorpusDriver:
+    """Driver falso que sirve las páginas del corpus como si Chrome ya las
+    hubiera renderizado: get, page_source, find_element por clase (lo que usan
+    los WebDriverWait de wait_for_match_widgets) y el recuento de filas de
+    ROWS_STATE_JS"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.page_source = None
+
+    def get(self, url):
+        self.page_source = self.pages[url]
+
+    def _class_match(self, cls):
+        return re.search(r'class="[^"]*(?<![\w-])' + re.escape(cls) + r'(?![\w-])', self.page_source)
+
+    def find_element(self, by, value):
+        match = self._class_match(value)
+        if not match:
+            raise NoSuchElementException(value)
+        # Solo hace falta el texto del header (missing_tables_error)
+        return FakeElement(re.sub(r'<[^>]+>', ' ', self.page_source[match.start():match.start() + 2000]))
+
+    def execute_script(self, script, *args):
+        if script == scraper.ROWS_STATE_JS:
+            return len(re.findall(r'class="[^"]*(?<![\w-])Opta-Player(?![\w-])', self.page_source))
+        raise NotImplementedError("CorpusDriver solo sirve HTML (sin --extract js/feed)")
+
+    def quit(self):
+        pass
+
+
+def run_pass(driver, entries, backend):
+    """Carga y parsea todas las páginas una vez; devuelve {id: resultado}"""
+    results = {}
+    for entry in entries:
+        html = scraper.load_match_page(driver, entry['url'])
+        results[entry['id']] = scraper.parse_match_page(html, entry['url'], entry['aux'], backend)
+    return results
+
+
+def describe_difference(result, golden):
+    """Primera diferencia entre el resultado de una página y el esperado"""
+    if golden is None:
+        return "sin filas esperadas (ejecuta --update-golden)"
+    for key in ('fecha', 'equipo_local', 'equipo_visitante'):
+        if result[key] != golden[key]:
+            return f"{key}: {result[key]!r} (esperado {golden[key]!r})"
+    rows, expected = result['players'], golden['players']
+    if len(rows) != len(expected):
+        return f"{len(rows)} filas (esperadas {len(expected)})"
+    for n, (row, want) in enumerate(zip(rows, expected), 1):
+        if row == want:
+            continue
+        for column in sorted(set(row) | set(want)):
+            if row.get(column) != want.get(column):
+                return f"fila {n} ({want.get('Jugador')}), {column}: {row.get(column)!r} (esperado {want.get(column)!r})"
+    return "metadatos del partido distintos"
+
+
+def record_pages(league_key, season, ids, case):
+    """Copia al corpus páginas del archivo raw con sus filas esperadas (bs4)"""
+    archived = scraper.load_jsonl(scraper.opta_raw_index_path(league_key, season))
+    index = {entry['id']: entry for entry in load_index()}
+    for match_id in ids:
+        if match_id not in archived:
+            print(f"⚠️ {match_id} no está en el archivo raw de {league_key} {season}")
+            continue
+        entry = archived[match_id]
+        html = scraper.load_raw_page(entry['sha256'])
+        save_page(match_id, html)
+        save_json(golden_path(match_id), scraper.parse_match_page(html, entry['url'], entry['aux']))
+        index[match_id] = {'id': match_id, 'league': league_key, 'url': entry['url'], 'aux': entry['aux'],
+                           'case': case or index.get(match_id, {}).get('case', '')}
+        print(f"✓ {match_id} añadido al corpus")
+    save_json(INDEX_FILE, list(index.values()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark offline del parseo con el corpus de páginas')
+    parser.add_argument('--parser', default=','.join(scraper.PAGE_BACKENDS),
+                        help='Backends de parseo separados por comas (por defecto %(default)s)')
+    parser.add_argument('--repeat', type=int, default=5, help='Pasadas por backend (se usa la mejor)')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Reescribir las filas esperadas con el resultado actual de bs4')
+    parser.add_argument('--record', choices=scraper.ALL_LEAGUES,
+                        help='Añadir al corpus páginas del archivo raw de esta liga')
+    parser.add_argument('--season', type=scraper.normalize_season, default=None)
+    parser.add_argument('--ids', default='', help='IDs de partido a añadir con --record, separados por comas')
+    parser.add_argument('--case', default='', help='Qué caso cubren las páginas añadidas con --record')
+    args = parser.parse_args()
+
+    scraper.extract_match_data.quiet_mode = True
+    if args.record:
+        ids = [match_id for match_id in args.ids.split(',') if match_id]
+        if not ids:
+            sys.exit("❌ Indica los partidos a añadir con --ids")
+        record_pages(args.record, args.season or scraper.current_season(), ids, args.case)
+        return
+
+    entries = load_index()
+    if not entries:
+        sys.exit(f"❌ Corpus vacío: {INDEX_FILE}")
+    driver = CorpusDriver({entry['url']: load_page(entry['id']) for entry in entries})
+    # El driver falso no cambia: no hay que esperar a que las filas se estabilicen
+    scraper.READINESS_QUIET['rows'] = 0
+
+    if args.update_golden:
+        for match_id, result in run_pass(driver, entries, 'bs4').items():
+            save_json(golden_path(match_id), result)
+        print(f"✓ Filas esperadas reescritas ({len(entries)} páginas)")
+        return
+
+    golden = {entry['id']: load_golden(entry['id']) for entry in entries}
+    total_kb = sum(len(html) for html in driver.pages.values()) / 1024
+    print(f"Corpus: {len(entries)} páginas, {total_kb:.0f} KB de HTML, "
+          f"{sum(len(g['players']) for g in golden.values() if g)} filas esperadas\n")
+
+    backends = [b for b in args.parser.split(',') if b]
+    mismatches = []
+    summary = []
+    for backend in backends:
+        if backend not in scraper.PAGE_BACKENDS:
+            sys.exit(f"❌ Backend desconocido: {backend} (disponibles: {', '.join(scraper.PAGE_BACKENDS)})")
+        best = None
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results = run_pass(driver, entries, backend)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        tracemalloc.start()
+        run_pass(driver, entries, backend)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        for entry in entries:
+            if results[entry['id']] != golden[entry['id']]:
+                mismatches.append((entry, backend, describe_difference(results[entry['id']], golden[entry['id']])))
+        summary.append((backend, best, peak))
+
+    print(f"{'backend':8} {'ms/página':>10} {'páginas/s':>10} {'pico Python (MB)':>17}")
+    for backend, best, peak in summary:
+        print(f"{backend:8} {best / len(entries) * 1000:10.1f} {len(entries) / best:10.1f} {peak / 2**20:17.1f}")
+    print(f"\nRSS máximo del proceso: {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} páginas con filas distintas a las esperadas:")
+        for entry, backend, difference in mismatches:
+            print(f"   {entry['id']} [{entry['league']}, {entry['case']}] ({backend}): {difference}")
+        sys.exit(1)
+    print(f"\n✓ Todas las páginas ({len(entries)}) producen las filas esperadas con {', '.join(backends)}")
+
+
+if __name__ == "__main__":
+    main()
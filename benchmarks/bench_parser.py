@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los backends de parseo de partidos (bs4 vs lxml)
+Uso: python3 benchmarks/bench_parser.py --league spain --season 2025-2026   # archivo raw
+     python3 benchmarks/bench_parser.py --dir paginas/                      # .html / .html.gz
+
+Parsea cada página guardada con todos los backends de PAGE_BACKENDS, muestra el
+tiempo por página de cada uno y comprueba que todos producen exactamente las
+mismas filas que bs4 (sale con código 1 si alguna página difiere).
+"""
+
+import os
+import sys
+import gzip
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+
+
+def pages_from_archive(league_key, season):
+    """[(nombre, url, aux, html)] de las páginas archivadas de una liga"""
+    entries = scraper.load_jsonl(scraper.opta_raw_index_path(league_key, season))
+    return [(entry['id'], entry['url'], entry['aux'], scraper.load_raw_page(entry['sha256']))
+            for entry in entries.values()]
+
+
+def pages_from_dir(path):
+    """[(nombre, url, aux, html)] de los .html / .html.gz de un directorio.
+
+    El nombre del archivo (sin extensión) hace de ID de partido.
+    """
+    pages = []
+    for k, name in enumerate(sorted(os.listdir(path))):
+        full = os.path.join(path, name)
+        if name.endswith('.html.gz'):
+            with open(full, 'rb') as f:
+                html = gzip.decompress(f.read()).decode('utf-8')
+        elif name.endswith('.html'):
+            with open(full, 'r', encoding='utf-8') as f:
+                html = f.read()
+        else:
+            continue
+        match_id = name.split('.')[0]
+        pages.append((match_id, f"{scraper.BASE_URL}/bench/match/view/{match_id}", k + 1, html))
+    return pages
+
+
+def time_parse(backend, html, url, aux, repeat):
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = scraper.parse_match_page(html, url, aux, backend)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de los backends de parseo')
+    parser.add_argument('--league', choices=scraper.ALL_LEAGUES)
+    parser.add_argument('--season', type=scraper.normalize_season, default=None)
+    parser.add_argument('--dir', help='Directorio con páginas .html o .html.gz')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones por página (se usa la mejor)')
+    args = parser.parse_args()
+
+    if args.dir:
+        pages = pages_from_dir(args.dir)
+    elif args.league:
+        pages = pages_from_archive(args.league, args.season or scraper.current_season())
+    else:
+        sys.exit("❌ Indica --dir o --league (páginas del archivo raw)")
+    if not pages:
+        sys.exit("❌ No hay páginas que medir")
+
+    scraper.extract_match_data.quiet_mode = True
+    backends = ['bs4'] + sorted(b for b in scraper.PAGE_BACKENDS if b != 'bs4')
+    totals = {backend: 0.0 for backend in backends}
+    mismatches = []
+
+    print(f"{'partido':28} {'KB':>6} " + ' '.join(f"{b + ' ms':>9}" for b in backends) + "  filas")
+    for name, url, aux, html in pages:
+        times = {}
+        reference = None
+        for backend in backends:
+            times[backend], result = time_parse(backend, html, url, aux, args.repeat)
+            totals[backend] += times[backend]
+            if reference is None:
+                reference = result
+            elif result != reference:
+                mismatches.append((name, backend))
+        print(f"{name[:28]:28} {len(html) / 1024:6.0f} "
+              + ' '.join(f"{times[b] * 1000:9.1f}" for b in backends)
+              + f"  {len(reference['players'])}")
+
+    print("\n" + "=" * 60)
+    for backend in backends:
+        speedup = totals['bs4'] / totals[backend] if totals[backend] else 0
+        print(f"{backend:6} {totals[backend] / len(pages) * 1000:8.1f} ms/página   "
+              f"{len(pages) / totals[backend]:7.1f} páginas/s   ({speedup:.1f}x)")
+
+    if mismatches:
+        print(f"\n❌ {len(mismatches)} páginas con filas distintas a bs4:")
+        for name, backend in mismatches:
+            print(f"   {name} ({backend})")
+        sys.exit(1)
+    print(f"\n✓ Todas las páginas ({len(pages)}) producen filas idénticas con todos los backends")
+
+
+if __name__ == "__main__":
+    main()
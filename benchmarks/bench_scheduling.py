@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark del reparto de partidos entre workers: lotes fijos vs cola compartida
+Uso: python3 benchmarks/bench_scheduling.py [--league ucl] [--season 2026-2027] [--workers 8]
+     python3 benchmarks/bench_scheduling.py --profile tiempos.json --real
+
+El perfil de tiempos por partido se obtiene de los datos ya guardados: los partidos
+que están en la BBDD se cargaron bien (rápidos) y los que están en match_urls pero
+no en la BBDD son los que agotaron el WebDriverWait (lentos: no jugados o páginas
+de UCL que no terminan de cargar). También se puede pasar un perfil medido con
+--profile (JSON con una lista de segundos o de {"url": ..., "seconds": ...}).
+
+Sin --real solo se simula el reparto (instantáneo). Con --real se lanzan procesos
+de verdad con un driver falso que duerme el tiempo de cada página multiplicado
+por --scale, usando el mismo run_match_queue que scraper.py.
+"""
+
+import os
+import sys
+import json
+import time
+import heapq
+import argparse
+import tempfile
+import multiprocessing
+import concurrent.futures
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+
+FAST_SECONDS = 6.0    # get + espera del header/tablas + sleep(1) de una página normal
+SLOW_SECONDS = 50.0   # WebDriverWait de 30s (header) + 20s (tablas) agotados
+
+PAGE_SECONDS = {}
+
+
+def profile_from_data(league_key, season):
+    """Perfil [(url, segundos)] a partir de match_urls y la BBDD guardados"""
+    with open(scraper.opta_urls_path(league_key, season), 'r') as f:
+        urls = [line.strip() for line in f if line.strip()]
+    done = {row.get('ID_PARTIDO') for row in scraper.load_csv(scraper.opta_csv_path(league_key, season))}
+    return [(url, FAST_SECONDS if scraper.match_id_from_url(url) in done else SLOW_SECONDS)
+            for url in urls]
+
+
+def profile_from_file(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    profile = []
+    for k, item in enumerate(data):
+        if isinstance(item, dict):
+            profile.append((item.get('url') or f'https://bench/match/view/p{k:04d}', float(item['seconds'])))
+        else:
+            profile.append((f'https://bench/match/view/p{k:04d}', float(item)))
+    return profile
+
+
+def static_makespan(seconds, workers):
+    """Lotes contiguos de tamaño ceil(n / workers), como hacía extract_all_data"""
+    batch_size = -(-len(seconds) // workers)
+    return max(sum(seconds[i:i + batch_size]) for i in range(0, len(seconds), batch_size))
+
+
+def queue_makespan(seconds, workers):
+    """Cada worker libre toma el siguiente partido de la cola"""
+    free_at = [0.0] * workers
+    for s in seconds:
+        heapq.heapreplace(free_at, free_at[0] + s)
+    return max(free_at)
+
+
+class SleepDriver:
+    def __init__(self, capture_network=False, **kwargs):
+        pass
+
+    def quit(self):
+        pass
+
+
+def sleep_load(driver, url):
+    time.sleep(PAGE_SECONDS[url])
+    return url
+
+
+def fake_parse(html, url, match_number, parser='bs4'):
+    return {'players': [{'ID_PARTIDO': scraper.match_id_from_url(url), 'Aux': match_number}]}
+
+
+def static_batch(batch):
+    for i, url in batch:
+        fake_parse(sleep_load(None, url), url, i)
+
+
+def run_static(tasks, workers):
+    batch_size = -(-len(tasks) // workers)
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+    start = time.perf_counter()
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(static_batch, batches))
+    return time.perf_counter() - start
+
+
+def run_queue(tasks, workers):
+    job = {'config': {'key': 'bench'}, 'tasks': tasks,
+           'journal_file': os.path.join(tempfile.mkdtemp(), 'journal.jsonl')}
+    start = time.perf_counter()
+    failed = scraper.run_match_queue([job], workers)
+    return time.perf_counter() - start, sum(len(f) for f in failed.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de reparto de partidos entre workers')
+    parser.add_argument('--league', default='ucl', choices=scraper.ALL_LEAGUES)
+    parser.add_argument('--season', type=scraper.normalize_season, default='2026-2027')
+    parser.add_argument('--profile', help='JSON con los segundos de cada página')
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--real', action='store_true', help='Ejecutar procesos reales (driver falso)')
+    parser.add_argument('--scale', type=float, default=0.01,
+                        help='Factor de tiempo para --real (0.01: 50s -> 0.5s)')
+    args = parser.parse_args()
+
+    profile = profile_from_file(args.profile) if args.profile else profile_from_data(args.league, args.season)
+    if not profile:
+        sys.exit("❌ Perfil vacío")
+    seconds = [s for _, s in profile]
+    slow = sum(1 for s in seconds if s >= SLOW_SECONDS)
+    origen = args.profile or f"{args.league} {args.season}"
+    print(f"Perfil: {origen} — {len(seconds)} páginas ({slow} lentas), {args.workers} workers\n")
+
+    ideal = max(sum(seconds) / args.workers, max(seconds))
+    static = static_makespan(seconds, args.workers)
+    dynamic = queue_makespan(seconds, args.workers)
+    print("Simulación (segundos de reloj):")
+    print(f"  {'lotes fijos':16} {static:9.1f}")
+    print(f"  {'cola compartida':16} {dynamic:9.1f}   ({static / dynamic:.2f}x)")
+    print(f"  {'cota inferior':16} {ideal:9.1f}")
+
+    if args.real:
+        multiprocessing.set_start_method('fork', force=True)
+        scraper.ERROR_LOG_FILE = os.path.join(tempfile.mkdtemp(prefix='bench_scheduling_'), 'errors.log')
+        scraper.setup_driver = SleepDriver
+        scraper.load_match_page = sleep_load
+        scraper.parse_match_page = fake_parse
+        PAGE_SECONDS.update({url: s * args.scale for url, s in profile})
+        tasks = [(k + 1, url) for k, (url, _) in enumerate(profile)]
+
+        static_real = run_static(tasks, args.workers)
+        queue_real, failures = run_queue(tasks, args.workers)
+        print(f"\nEjecución real (escala {args.scale}):")
+        print(f"  {'lotes fijos':16} {static_real:9.2f}s")
+        print(f"  {'cola compartida':16} {queue_real:9.2f}s   ({static_real / queue_real:.2f}x)")
+        if failures:
+            sys.exit(f"❌ {failures} partidos fallaron en la cola compartida")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark de varias pestañas por Chrome (--tabs) frente a un Chrome por worker
+Uso: python3 benchmarks/bench_tabs.py --league spain --season 2025-2026 [--matches 40]
+     python3 benchmarks/bench_tabs.py --league ucl --configs 8x1,2x4,2x8,4x8
+
+Carga los mismos partidos (los primeros --matches de match_urls) con cada
+configuración workers x pestañas usando el mismo run_match_queue que
+scraper.py, y muestra el ritmo (partidos/min), la memoria máxima y media de
+todos los procesos (workers, chromedriver y Chrome, medida cada segundo con
+process_tree_rss) y los partidos fallidos. 8x1 es el modo actual --workers 8.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+
+
+def parse_config(value):
+    workers, _, tabs = value.partition('x')
+    return int(workers), int(tabs or 1)
+
+
+class RssSampler(threading.Thread):
+    """Mide cada segundo la memoria de este proceso y todos sus descendientes"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.samples = []
+        self.stop = threading.Event()
+
+    def run(self):
+        while not self.stop.wait(1.0):
+            self.samples.append(scraper.process_tree_rss(os.getpid()))
+
+
+def run_config(urls, workers, tabs, options):
+    job = {'config': {'key': 'bench', 'name': 'bench'}, 'tasks': list(enumerate(urls, 1)),
+           'journal_file': os.path.join(tempfile.mkdtemp(), 'journal.jsonl')}
+    sampler = RssSampler()
+    sampler.start()
+    start = time.perf_counter()
+    failed = scraper.run_match_queue([job], workers, options={**options, 'tabs': tabs})
+    elapsed = time.perf_counter() - start
+    sampler.stop.set()
+    sampler.join()
+    samples = sampler.samples or [0]
+    return elapsed, max(samples), sum(samples) / len(samples), len(failed['bench'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de pestañas por Chrome')
+    parser.add_argument('--league', default='spain', choices=scraper.ALL_LEAGUES)
+    parser.add_argument('--season', type=scraper.normalize_season, default=None)
+    parser.add_argument('--matches', type=int, default=40, help='Partidos a cargar con cada configuración')
+    parser.add_argument('--configs', default='8x1,2x4,2x8,4x8',
+                        help='Configuraciones workersxpestañas separadas por comas (por defecto %(default)s)')
+    parser.add_argument('--extract', choices=['html', 'js'], default='js')
+    args = parser.parse_args()
+
+    season = args.season or scraper.current_season()
+    urls = scraper.read_match_urls(scraper.opta_urls_path(args.league, season))[:args.matches]
+    if not urls:
+        sys.exit(f"❌ No hay URLs de {args.league} {season}: ejecuta antes scraper.py urls")
+
+    options = {'extract': args.extract, 'blocking': scraper.BLOCKING_DEFAULTS, 'disk_cache': True,
+               'retries': 0}
+    results = []
+    for config in args.configs.split(','):
+        workers, tabs = parse_config(config)
+        print(f"\n=== {workers} workers x {tabs} pestañas ===")
+        results.append((workers, tabs, *run_config(urls, workers, tabs, options)))
+
+    print(f"\n{args.league} {season}: {len(urls)} partidos por configuración (--extract {args.extract})\n")
+    print(f"{'workers x pestañas':19} {'en vuelo':>8} {'partidos/min':>13} {'RSS máx (MB)':>13} "
+          f"{'RSS medio (MB)':>15} {'fallidos':>9}")
+    for workers, tabs, elapsed, peak, mean, failed in results:
+        print(f"{f'{workers} x {tabs}':19} {workers * tabs:8} {len(urls) / elapsed * 60:13.1f} "
+              f"{peak / 2**20:13.0f} {mean / 2**20:15.0f} {failed:9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Benchmark de extremo a extremo (urls -> data) contra el sustituto local de Opta
+Uso: python3 benchmarks/bench_throughput.py --league spain --season 2025-2026 --workers 1,2,4,8
+     python3 benchmarks/bench_throughput.py --matches 80 --latency 1.5 --jitter 1 --failure-rate 0.05 --never-loads 0.05
+     python3 benchmarks/bench_throughput.py --http-first --no-urls    # sin Chrome
+
+Arranca benchmarks/opta_standin.py en un proceso aparte, apunta el scraper a él
+(BASE_URL / OPTA_BASE_URL) y, con todos los archivos en un directorio temporal:
+
+  1. busca las URLs de la temporada con extract_urls, como scraper.py urls
+     (con --no-urls se leen los enlaces del calendario con una petición HTTP)
+  2. para cada número de workers de --workers extrae todos los partidos desde
+     cero con extract_all_data, como scraper.py data
+
+y muestra, por número de workers, el ritmo (partidos/min de reloj), la latencia
+de los partidos que salieron bien (p50/p95/p99/máximo de lo que tardó su carga,
+ver match_latency), los intentos y los partidos fallidos.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import tempfile
+import subprocess
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+import scraper  # noqa: E402
+
+STANDIN_START_TIMEOUT = 15
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_standin(args, port, probe_url):
+    """Lanza opta_standin.py y espera a que sirva probe_url; devuelve el proceso"""
+    command = [sys.executable, os.path.join(BENCH_DIR, 'opta_standin.py'), '--port', str(port),
+               '--matches', str(args.matches), '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--failure-rate', str(args.failure_rate), '--never-loads', str(args.never_loads),
+               '--seed', str(args.seed)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    deadline = time.time() + STANDIN_START_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            sys.exit("❌ El sustituto de Opta no ha arrancado")
+        try:
+            requests.get(probe_url, timeout=STANDIN_START_TIMEOUT)
+            return process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.kill()
+    sys.exit("❌ El sustituto de Opta no responde")
+
+
+def stop_standin(process):
+    """Para el sustituto y devuelve su recuento de respuestas"""
+    process.send_signal(signal.SIGINT)
+    try:
+        output, _ = process.communicate(timeout=5)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        output, _ = process.communicate()
+    return output.strip().splitlines()[-1] if output.strip() else ''
+
+
+def bench_config(league_key, season, tmp):
+    """Config de la liga con todos sus archivos en el directorio temporal"""
+    config = scraper.build_league_config(league_key, season)
+    for key, name in (('csv_file', 'bbdd.csv'), ('urls_file', 'match_urls.txt'),
+                      ('journal_file', 'journal.jsonl'), ('raw_index_file', 'raw_index.jsonl'),
+                      ('fixtures_file', 'fixtures.json'), ('metrics_file', 'metrics.json'),
+                      ('summary_file', 'resumen.csv')):
+        config[key] = os.path.join(tmp, name)
+    return config
+
+
+def urls_from_calendar(config):
+    """Escribe las URLs de los partidos leyendo los enlaces del calendario por HTTP"""
+    response = requests.get(config['url'], timeout=scraper.HTTP_TIMEOUT)
+    response.raise_for_status()
+    urls = sorted({urljoin(config['url'], href)
+                   for href in re.findall(r'href="([^"]*/match/view/[a-z0-9]+)"', response.text)})
+    with open(config['urls_file'], 'w') as f:
+        for url in urls:
+            f.write(url + '\n')
+    return urls
+
+
+def run_workers(config, workers, parsers, options):
+    """Extrae todos los partidos desde cero con workers; devuelve
+    (segundos, [latencias de los partidos bien], métricas de la liga)"""
+    for key in ('csv_file', 'journal_file', 'metrics_file'):
+        if os.path.exists(config[key]):
+            os.remove(config[key])
+
+    # finish_league_job borra el journal: las latencias se leen antes
+    latencies = []
+    finish_league_job = scraper.finish_league_job
+
+    def finish(job, failed):
+        latencies.extend(record['seconds'] for record in scraper.load_journal(job['journal_file']).values()
+                         if record.get('seconds') is not None)
+        finish_league_job(job, failed)
+
+    scraper.finish_league_job = finish
+    try:
+        start = time.perf_counter()
+        scraper.extract_all_data(config, workers=workers, parsers=parsers, options=options)
+        elapsed = time.perf_counter() - start
+    finally:
+        scraper.finish_league_job = finish_league_job
+
+    with open(config['metrics_file'], 'r', encoding='utf-8') as f:
+        return elapsed, latencies, json.load(f)
+
+
+def format_seconds(value):
+    return f"{value:8.2f}" if value is not None else f"{'-':>8}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark urls -> data contra el sustituto local de Opta')
+    parser.add_argument('--league', default='spain', choices=scraper.ALL_LEAGUES)
+    parser.add_argument('--season', type=scraper.normalize_season, default='2025-2026')
+    parser.add_argument('--workers', default='1,2,4,8', help='Números de workers separados por comas')
+    parser.add_argument('--parsers', type=int, default=scraper.DEFAULT_PARSERS)
+    parser.add_argument('--matches', type=int, default=40, help='Partidos en el calendario servido')
+    parser.add_argument('--latency', type=float, default=1.0, help='Segundos de cada respuesta del sustituto')
+    parser.add_argument('--jitter', type=float, default=0.5, help='Segundos aleatorios (0 a N) sumados a la latencia')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='Fracción de respuestas 503')
+    parser.add_argument('--never-loads', type=float, default=0.0,
+                        help='Fracción de partidos cuyo widget nunca termina de cargar')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--header-timeout', type=float, default=scraper.HEADER_TIMEOUT,
+                        help='Espera máxima del header de cada partido (por defecto %(default)s)')
+    parser.add_argument('--players-timeout', type=float, default=scraper.PLAYERS_TIMEOUT,
+                        help='Espera máxima de las tablas de jugadores (por defecto %(default)s)')
+    parser.add_argument('--retries', type=int, default=0,
+                        help='Reintentos por partido (por defecto 0: cada fallo cuenta una vez)')
+    parser.add_argument('--retry-backoff', type=float, default=scraper.EXTRACTION_DEFAULTS['retry_backoff'])
+    parser.add_argument('--extract', choices=['html', 'js'], default='html')
+    parser.add_argument('--parser', choices=sorted(scraper.PAGE_BACKENDS), default='bs4')
+    parser.add_argument('--tabs', type=int, default=1)
+    parser.add_argument('--http-first', action='store_true', help='Probar cada partido por HTTP antes que con Chrome')
+    parser.add_argument('--no-urls', action='store_true',
+                        help='Leer las URLs del calendario por HTTP en vez de con extract_urls (sin Chrome)')
+    args = parser.parse_args()
+
+    if args.season not in scraper.LEAGUES[args.league]['seasons']:
+        sys.exit(f"❌ El sustituto solo sirve las temporadas de LEAGUES: "
+                 f"{', '.join(sorted(scraper.LEAGUES[args.league]['seasons']))}")
+
+    port = free_port()
+    base_url = f"http://127.0.0.1:{port}{urlsplit(scraper.DEFAULT_BASE_URL).path}"
+    # Los workers heredan BASE_URL (fork) o lo leen de OPTA_BASE_URL al importar scraper
+    scraper.BASE_URL = base_url
+    os.environ['OPTA_BASE_URL'] = base_url
+    # Igual con las esperas: los workers se crean con fork
+    scraper.HEADER_TIMEOUT = args.header_timeout
+    scraper.PLAYERS_TIMEOUT = args.players_timeout
+
+    tmp = tempfile.mkdtemp(prefix='bench_throughput_')
+    scraper.ERROR_LOG_FILE = os.path.join(tmp, 'errors.log')
+    scraper.STAT_SCHEMA_FILE = os.path.join(tmp, 'opta_stat_schema.json')
+    config = bench_config(args.league, args.season, tmp)
+    standin = start_standin(args, port, config['url'])
+    options = {'extract': args.extract, 'parser': args.parser, 'tabs': args.tabs, 'http_first': args.http_first,
+               'retries': args.retries, 'retry_backoff': args.retry_backoff,
+               'blocking': scraper.BLOCKING_DEFAULTS, 'disk_cache': False}
+    results = []
+    try:
+        start = time.perf_counter()
+        if args.no_urls:
+            urls = urls_from_calendar(config)
+        else:
+            urls = scraper.extract_urls(config, verbose=False, options=options)
+        urls_seconds = time.perf_counter() - start
+
+        for workers in (int(w) for w in args.workers.split(',') if w):
+            print(f"\n=== {workers} workers ===")
+            results.append((workers, *run_workers(config, workers, args.parsers, options)))
+    finally:
+        counts = stop_standin(standin)
+
+    print(f"\nSustituto: {base_url} — latencia {args.latency}s + 0-{args.jitter}s, "
+          f"503 {args.failure_rate:.0%}, nunca cargan {args.never_loads:.0%}")
+    print(f"{counts}")
+    print(f"\n{args.league} {args.season}: {len(urls)} partidos, URLs en {urls_seconds:.1f}s "
+          f"({'HTTP' if args.no_urls else 'extract_urls'})\n")
+    print(f"{'workers':>7} {'partidos/min':>13} {'p50 (s)':>8} {'p95 (s)':>8} {'p99 (s)':>8} {'máx (s)':>8} "
+          f"{'intentos':>9} {'fallidos':>9}")
+    for workers, elapsed, latencies, metrics in results:
+        print(f"{workers:7} {metrics['ok'] / elapsed * 60:13.1f} "
+              f"{format_seconds(scraper.percentile(latencies, 50))} {format_seconds(scraper.percentile(latencies, 95))} "
+              f"{format_seconds(scraper.percentile(latencies, 99))} {format_seconds(max(latencies, default=None))} "
+              f"{metrics['attempts']:9} {metrics['failed']:9}")
+    print(f"\nArchivos de la última ejecución en {tmp}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Sustituto local de la web de Opta para pruebas de extremo a extremo
+Uso: python3 benchmarks/opta_standin.py [--port 8765] [--matches 40] [--latency 1.0] [--jitter 0.5]
+                                        [--failure-rate 0.02] [--never-loads 0.05]
+     OPTA_BASE_URL=http://127.0.0.1:8765/en_GB/soccer python3 scraper.py all --league spain --season 2025-2026
+
+Sirve, en las mismas rutas que build_url y los enlaces de la web real:
+
+  .../<slug>-<temporada>/<id_torneo>/opta-player-stats
+        calendario de cada liga y temporada de LEAGUES con --matches partidos
+        terminados (enlaces /match/view/<id> con su fecha y marcador)
+  .../<slug>-<temporada>/<id_torneo>/match/view/<id>
+        la página renderizada de un partido, tomada del corpus de
+        benchmarks/corpus (las de la misma liga si las hay)
+
+Cada respuesta tarda --latency segundos más un aleatorio de 0 a --jitter. Una
+fracción --failure-rate de las peticiones de partidos responde 503 (fallo
+pasajero: al reintentar puede ir bien) y una fracción --never-loads de los
+partidos (siempre los mismos para una --seed) sirve la página sin el widget,
+que nunca termina de cargar, como las páginas de UCL que agotan las esperas.
+
+Ojo: con OPTA_BASE_URL, scraper.py escribe en las rutas de siempre de data/opta;
+benchmarks/bench_throughput.py usa un directorio temporal.
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+from datetime import date, timedelta
+from urllib.parse import urlsplit
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scraper  # noqa: E402
+import bench_corpus  # noqa: E402
+
+# Fecha de los primeros MATCHES_PER_DAY partidos del calendario; luego un día más cada tanda
+FIRST_MATCH_DATE = date(2025, 8, 15)
+MATCHES_PER_DAY = 10
+
+NEVER_LOADS_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Opta Player Stats</title></head><body>
+<main><div class="Opta Opta-Widget Opta-Loading"><div class="Opta-Loader">Loading...</div></div></main>
+</body></html>
+"""
+
+ERROR_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>503 Service Unavailable</title></head><body>
+<h1>Service Unavailable</h1></body></html>
+"""
+
+
+def league_prefix(league_key, season):
+    """Ruta (ya codificada) de la competición: /en_GB/soccer/<slug>-<temporada>/<id_torneo>"""
+    base = scraper.LEAGUES[league_key]
+    season_path = urlsplit(scraper.build_url(base['slug'], season, base['seasons'][season])).path
+    return season_path.rsplit('/', 1)[0]
+
+
+def match_ids(league_key, season, matches):
+    """IDs (solo [a-z0-9], como los de Opta) de los partidos servidos de una liga"""
+    return [f"{league_key}x{season[:4]}x{k:04d}" for k in range(matches)]
+
+
+class StandinSite:
+    """Páginas servidas y comportamiento (latencia, fallos) del sustituto"""
+
+    def __init__(self, matches=40, latency=0.0, jitter=0.0, failure_rate=0.0, never_loads=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {}
+
+        corpus = bench_corpus.load_index()
+        if not corpus:
+            sys.exit(f"❌ Corpus vacío: {bench_corpus.INDEX_FILE}")
+        pages = {entry['id']: bench_corpus.load_page(entry['id']) for entry in corpus}
+
+        self.season_pages = {}   # ruta -> HTML del calendario
+        self.match_pages = {}    # ruta -> (HTML, nunca carga)
+        for league_key, base in scraper.LEAGUES.items():
+            league_pages = [pages[e['id']] for e in corpus if e['league'] == league_key] or list(pages.values())
+            for season in base['seasons']:
+                prefix = league_prefix(league_key, season)
+                fixtures = []
+                for k, match_id in enumerate(match_ids(league_key, season, matches)):
+                    path = f"{prefix}/match/view/{match_id}"
+                    never = random.Random(f"{seed}:{match_id}").random() < never_loads
+                    self.match_pages[path] = (league_pages[k % len(league_pages)], never)
+                    fixtures.append((k, path))
+                self.season_pages[f"{prefix}/opta-player-stats"] = self.season_page(base, season, fixtures)
+
+    def season_page(self, base, season, fixtures):
+        rows = []
+        for k, path in fixtures:
+            if k % MATCHES_PER_DAY == 0:
+                day = FIRST_MATCH_DATE + timedelta(days=k // MATCHES_PER_DAY)
+                rows.append(f'<tr class="Opta-Date-Row"><th colspan="4">{day.strftime("%a %d %B %Y")}</th></tr>')
+            rows.append(f'<tr class="Opta-Fixture"><td class="Opta-Home">Local {k}</td><td class="Opta-Score">'
+                        f'{k % 4} - {k % 3}</td><td class="Opta-Away">Visitante {k}</td>'
+                        f'<td><a href="{path}">Player stats</a></td></tr>')
+        return f'''<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{base['name']} {season} - Opta Player Stats</title></head>
+<body><main><div class="Opta Opta-Widget Opta-Fixtures"><table><tbody>
+{"".join(rows)}
+</tbody></table></div></main></body></html>
+'''
+
+    def respond(self, path):
+        """(código, HTML) de una ruta, después de la latencia configurada"""
+        with self.lock:
+            delay = self.latency + self.random.uniform(0, self.jitter)
+            fail = self.random.random() < self.failure_rate
+        time.sleep(delay)
+        if path in self.season_pages:
+            return self.count(200, self.season_pages[path])
+        if path not in self.match_pages:
+            return self.count(404, ERROR_PAGE.replace('503 Service Unavailable', '404 Not Found'))
+        if fail:
+            return self.count(503, ERROR_PAGE)
+        html, never = self.match_pages[path]
+        if never:
+            self.count('never', None)
+            return 200, NEVER_LOADS_PAGE
+        return self.count(200, html)
+
+    def count(self, status, html):
+        with self.lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+        return status, html
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    site = None
+    verbose = False
+
+    def do_GET(self):
+        status, html = self.site.respond(urlsplit(self.path).path)
+        body = html.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sustituto local de la web de Opta')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--matches', type=int, default=40, help='Partidos en el calendario de cada liga')
+    parser.add_argument('--latency', type=float, default=0.0, help='Segundos de cada respuesta')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Segundos aleatorios (0 a N) sumados a la latencia')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Fracción de peticiones de partidos que responden 503')
+    parser.add_argument('--never-loads', type=float, default=0.0,
+                        help='Fracción de partidos cuyo widget nunca termina de cargar')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--verbose', action='store_true', help='Mostrar cada petición')
+    args = parser.parse_args()
+
+    StandinHandler.site = StandinSite(matches=args.matches, latency=args.latency, jitter=args.jitter,
+                                      failure_rate=args.failure_rate, never_loads=args.never_loads, seed=args.seed)
+    StandinHandler.verbose = args.verbose
+    server = ThreadingHTTPServer((args.host, args.port), StandinHandler)
+    server.daemon_threads = True
+    base_path = urlsplit(scraper.BASE_URL).path
+    print(f"🌐 Sustituto de Opta en http://{args.host}:{server.server_port}{base_path}", flush=True)
+    print(f"   OPTA_BASE_URL=http://{args.host}:{server.server_port}{base_path}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\nRespuestas: {StandinHandler.site.counts}")
+
+
+if __name__ == "__main__":
+    main()
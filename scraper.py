@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Extractor de Datos de Partidos - Ligas y competiciones europeas
-Uso: python3 scraper.py [urls|data|all|seasons] [--league <liga>] [--season <YYYY-YYYY>]
+Uso: python3 scraper.py [urls|data|all|seasons|reparse] [--league <liga>] [--season <YYYY-YYYY>]
 """
 
 import sys
@@ -9,12 +9,22 @@ import os
 import json
 import time
 import csv
+import io
 import re
+import gzip
+import base64
+import hashlib
+import queue
+import heapq
+import itertools
 import math
+import asyncio
+import fnmatch
 import argparse
+import contextlib
 import multiprocessing
 import concurrent.futures
-from datetime import date
+from datetime import date, datetime
 from urllib.parse import quote
 from tqdm import tqdm
 from selenium import webdriver
@@ -22,17 +32,38 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from bs4 import BeautifulSoup
+import lxml.html
+import requests
 
-BASE_URL = 'https://optaplayerstats.statsperform.com/en_GB/soccer'
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from playwright.async_api import async_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeout
+except ImportError:
+    async_playwright = PlaywrightError = PlaywrightTimeout = None
+
+DEFAULT_BASE_URL = 'https://optaplayerstats.statsperform.com/en_GB/soccer'
+
+# OPTA_BASE_URL apunta el scraper a otro servidor con las mismas rutas (p.ej. el
+# sustituto local de benchmarks/opta_standin.py)
+BASE_URL = os.environ.get('OPTA_BASE_URL', DEFAULT_BASE_URL).rstrip('/')
 
 # Estructura de salida organizada (rutas ancladas al directorio del proyecto)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_OPTA_DIR = os.path.join(BASE_DIR, 'data', 'opta')
 URLS_DIR = os.path.join(DATA_OPTA_DIR, 'urls')
+JOURNAL_DIR = os.path.join(DATA_OPTA_DIR, 'journal')
+RAW_DIR = os.path.join(DATA_OPTA_DIR, 'raw')
+METRICS_DIR = os.path.join(DATA_OPTA_DIR, 'metrics')
 LOGS_DIR = os.path.join(BASE_DIR, 'logs')
 CACHE_DIR = os.path.join(BASE_DIR, 'cache')
 SEASON_CACHE_FILE = os.path.join(CACHE_DIR, 'seasons_cache.json')
+STAT_SCHEMA_FILE = os.path.join(CACHE_DIR, 'opta_stat_schema.json')
 ERROR_LOG_FILE = os.path.join(LOGS_DIR, 'scraper_errors.log')
 
 
@@ -48,6 +79,32 @@ def opta_csv_path(league_key, season):
 def opta_urls_path(league_key, season):
     return os.path.join(URLS_DIR, f"match_urls_{league_key}_{season}.txt")
 
+
+def opta_fixtures_path(league_key, season):
+    return os.path.join(URLS_DIR, f"fixtures_{league_key}_{season}.json")
+
+
+def opta_journal_path(league_key, season):
+    return os.path.join(JOURNAL_DIR, f"journal_{league_key}_{season}.jsonl")
+
+
+def opta_raw_index_path(league_key, season):
+    return os.path.join(RAW_DIR, f"index_{league_key}_{season}.jsonl")
+
+
+def opta_metrics_path(league_key, season):
+    return os.path.join(METRICS_DIR, f"metrics_{league_key}_{season}.json")
+
+
+def opta_summary_path(league_key, season):
+    return os.path.join(DATA_OPTA_DIR, f"resumen_partidos_{league_key}_{season}.csv")
+
+
+def match_id_from_url(url):
+    """ID de Opta de un partido a partir de su URL (/match/view/<id>)"""
+    match = re.search(r'/match/view/([a-z0-9]+)', url)
+    return match.group(1) if match else None
+
 # Configuración de ligas.
 # 'seasons' mapea temporada -> ID de torneo de Opta, que cambia cada temporada.
 # Las temporadas no listadas aquí se descubren automáticamente desde el selector
@@ -119,6 +176,32 @@ LEAGUES = {
     }
 }
 
+# Procesos de parseo por defecto en la extracción en dos etapas (navegador -> parseo)
+DEFAULT_PARSERS = 2
+
+# Opciones de extracción que viajan a los workers (se sobrescriben desde main)
+EXTRACTION_DEFAULTS = {
+    'archive_raw': False,   # guardar el HTML de cada partido en data/opta/raw/
+    'parser': 'bs4',        # backend de parseo del HTML (ver PAGE_BACKENDS)
+    'extract': 'html',      # 'html': page_source + parseo en Python; 'js': ver MATCH_SNAPSHOT_JS;
+                            # 'feed': feed de Opta del log de red (ver load_match_feed)
+    'readiness': None,      # máximos de espera de la página (ver READINESS_DEFAULTS)
+    'blocking': None,       # peticiones bloqueadas en Chrome (ver BLOCKING_DEFAULTS); None = ninguna
+    'disk_cache': False,    # caché HTTP en disco por worker en cache/chrome/
+    'recycle_pages': 0,     # reiniciar Chrome cada N partidos (0 = nunca)
+    'max_rss_mb': 0,        # reiniciar Chrome si su memoria pasa de N MB (0 = sin límite)
+    'retries': 2,           # reintentos de un partido con fallo transitorio (ver MatchError)
+    'retry_backoff': 15,    # segundos antes del primer reintento (se duplica en cada uno)
+    'tabs': 1,              # partidos cargándose a la vez en cada Chrome (ver tab_worker)
+    'backend': 'selenium',  # 'selenium' o 'playwright' (ver playwright_worker)
+    'http_first': False,    # probar antes una petición HTTP sin navegador (ver HttpFetcher)
+    'feed_url': None,       # plantilla de la URL del feed con {match_id} (si no, la aprendida)
+    'profile': None,        # ejecución perfilada (ver set_profiling); None = sin perfilado
+}
+
+def extraction_options(options=None):
+    return {**EXTRACTION_DEFAULTS, **(options or {})}
+
 ALL_LEAGUES = ['spain', 'england', 'germany', 'italy', 'france', 'ucl', 'uel', 'spain2']
 
 def current_season(today=None):
@@ -237,141 +320,1061 @@ def build_league_config(league_key, season):
         'season': season,
         'url': build_url(base['slug'], season, resolve_tournament_id(league_key, season)),
         'csv_file': opta_csv_path(league_key, season),
-        'urls_file': opta_urls_path(league_key, season)
+        'urls_file': opta_urls_path(league_key, season),
+        'journal_file': opta_journal_path(league_key, season),
+        'raw_index_file': opta_raw_index_path(league_key, season),
+        'fixtures_file': opta_fixtures_path(league_key, season),
+        'metrics_file': opta_metrics_path(league_key, season),
+        'summary_file': opta_summary_path(league_key, season)
     }
 
-def setup_driver():
-    """Configura el driver de Chrome"""
+# Peticiones que Chrome no llega a hacer (Network.setBlockedURLs): 'types' son
+# tipos de recurso (ver BLOCKED_RESOURCE_PATTERNS) y 'urls' patrones con comodín *
+BLOCKING_DEFAULTS = {
+    'types': ['image', 'font', 'media'],
+    'urls': [
+        '*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+        '*googlesyndication.com*', '*adservice.google.*', '*facebook.net*', '*hotjar.com*',
+        '*scorecardresearch.com*', '*quantserve.com*', '*chartbeat.*', '*newrelic.com*',
+        '*nr-data.net*', '*cookielaw.org*',
+    ],
+}
+
+BLOCKED_RESOURCE_PATTERNS = {
+    'image': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.svg*', '*.ico*'],
+    'font': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'stylesheet': ['*.css*'],
+    'media': ['*.mp4*', '*.webm*', '*.mp3*', '*.m3u8*'],
+}
+
+CHROME_CACHE_DIR = os.path.join(CACHE_DIR, 'chrome')
+
+def chrome_cache_dir(name):
+    """Directorio de caché HTTP persistente de un Chrome (uno por worker:
+    dos Chrome a la vez no pueden compartir la misma caché en disco)"""
+    return os.path.join(CHROME_CACHE_DIR, name)
+
+def blocked_url_patterns(blocking):
+    """Patrones para Network.setBlockedURLs a partir de {'types', 'urls'}"""
+    if not blocking:
+        return []
+    patterns = []
+    for resource_type in blocking.get('types', []):
+        patterns.extend(BLOCKED_RESOURCE_PATTERNS[resource_type])
+    patterns.extend(blocking.get('urls', []))
+    return patterns
+
+def blocked_url_regex(blocking):
+    """Expresión regular equivalente a blocked_url_patterns (para Playwright)"""
+    patterns = blocked_url_patterns(blocking)
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)) if patterns else None
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Flags de Chrome comunes a Selenium (setup_driver) y Playwright (playwright_worker)
+CHROME_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-blink-features=AutomationControlled",
+    # Deshabilitar imágenes para cargar más rápido
+    "--blink-settings=imagesEnabled=false",
+    # Perfil ligero: nada de tráfico ni procesos de fondo que no sean la página
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--no-first-run",
+    "--mute-audio",
+    # Que las pestañas en segundo plano (--tabs) no se carguen más despacio
+    "--disable-background-timer-throttling",
+    "--disable-renderer-backgrounding",
+    "--disable-backgrounding-occluded-windows",
+]
+
+def setup_driver(capture_network=False, blocking=None, cache_dir=None):
+    """Configura el driver de Chrome.
+
+    Con capture_network se activa el log de red (performance) que usa
+    load_match_feed para leer el feed de Opta. blocking son las peticiones que
+    se bloquean (ver BLOCKING_DEFAULTS) y cache_dir un directorio de caché HTTP
+    que se conserva entre ejecuciones (los bundles JS de Opta no se vuelven a
+    descargar).
+    """
     chrome_options = Options()
     chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-    # Deshabilitar imágenes para cargar más rápido
-    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
-    return webdriver.Chrome(options=chrome_options)
+    chrome_options.add_argument(f"user-agent={USER_AGENT}")
+    for arg in CHROME_ARGS:
+        chrome_options.add_argument(arg)
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+        chrome_options.add_argument(f"--disk-cache-dir={cache_dir}")
+    if capture_network:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+    driver = webdriver.Chrome(options=chrome_options)
+
+    patterns = blocked_url_patterns(blocking)
+    if patterns:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+    return driver
+
+# ---------------------------------------------------------------------------
+# Perfilado por fases (--profile)
+#
+# Con --profile cada partido apunta cuánto tardó cada fase (driver.get, espera
+# del header, de las tablas y de las filas, page_source, construcción del DOM,
+# estrategias de nombres de equipo, tablas de jugadores...) y los bytes de su
+# página en logs/profile.jsonl, junto con la búsqueda de URLs y la escritura
+# del CSV. `scraper.py profile` resume la última ejecución. Sin --profile
+# profile_phase no mide nada.
+# ---------------------------------------------------------------------------
+
+PROFILE_FILE = os.path.join(LOGS_DIR, 'profile.jsonl')
+
+# Identificador de la ejecución que se está perfilando (None = sin perfilado)
+PROFILE_RUN = None
+
+_phases = {}
+
+def set_profiling(run=None):
+    """Activa el perfilado de este proceso para la ejecución run (None lo desactiva)"""
+    global PROFILE_RUN
+    PROFILE_RUN = run
+    _phases.clear()
+
+@contextlib.contextmanager
+def profile_phase(name):
+    """Acumula en la fase name el tiempo del bloque (solo con perfilado activo)"""
+    if PROFILE_RUN is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases[name] = _phases.get(name, 0.0) + time.perf_counter() - start
+
+def record_phase(name, start):
+    """Como profile_phase, para un tramo que empezó en start (perf_counter)"""
+    if PROFILE_RUN is not None:
+        _phases[name] = _phases.get(name, 0.0) + time.perf_counter() - start
+
+def take_phases():
+    """Segundos por fase desde la última llamada"""
+    phases = {name: round(seconds, 4) for name, seconds in _phases.items()}
+    _phases.clear()
+    return phases
+
+def write_profile(record):
+    """Añade un registro de la ejecución en curso a logs/profile.jsonl"""
+    if PROFILE_RUN is not None:
+        append_jsonl(PROFILE_FILE, {'run': PROFILE_RUN, **record})
+
+# ---------------------------------------------------------------------------
+# Esperas de carga
+#
+# En vez de dormir un tiempo fijo (5s tras abrir el calendario, 2s por scroll y
+# 1s tras cargar cada partido) se espera a señales concretas de la página: que
+# la red quede inactiva, que el número de enlaces a partidos deje de crecer y que
+# el número de filas de jugadores deje de cambiar. Cada espera tiene un máximo.
+# ---------------------------------------------------------------------------
+
+# Máximo (segundos) de cada espera; se cambian con --wait-page/--wait-scroll/--wait-rows
+READINESS_DEFAULTS = {
+    'page': 5,      # calendario abierto: red inactiva
+    'scroll': 5,    # cada scroll: altura, enlaces a partidos y red estables
+    'rows': 2,      # cada partido: número de filas de jugadores estable
+}
 
-def extract_urls(league_config):
-    """Extrae URLs de todos los partidos"""
-    print("="*80)
-    print(f"EXTRAYENDO URLs DE PARTIDOS - {league_config['name']} {league_config['season']}")
-    print("="*80)
+# Segundos sin cambios para dar por estable cada señal
+READINESS_QUIET = {'page': 0.5, 'scroll': 1.0, 'rows': 0.3}
+
+# Lo que dormían los sleep fijos de antes, para calcular el ahorro
+FIXED_SLEEPS = {'page': 5, 'scroll': 2, 'rows': 1}
+
+READINESS_POLL = 0.1
+
+READINESS = dict(READINESS_DEFAULTS)
+
+# Red inactiva: documento cargado y sin recursos nuevos
+PAGE_STATE_JS = "return [document.readyState, performance.getEntriesByType('resource').length];"
+SCROLL_STATE_JS = """return [document.body.scrollHeight,
+        document.querySelectorAll('a[href*="/match/view/"]').length,
+        performance.getEntriesByType('resource').length];"""
+ROWS_STATE_JS = "return document.getElementsByClassName('Opta-Player').length;"
+
+_waits = {}
+
+def set_readiness(bounds=None):
+    """Fija los máximos de espera de este proceso (None = por defecto)"""
+    READINESS.clear()
+    READINESS.update(READINESS_DEFAULTS)
+    READINESS.update(bounds or {})
+
+def take_waits():
+    """Segundos esperados por fase desde la última llamada ({fase: [segundos, veces]})"""
+    waits = {phase: list(value) for phase, value in _waits.items()}
+    _waits.clear()
+    return waits
+
+def wait_until_stable(driver, phase, script, ready=None):
+    """Ejecuta script hasta que su resultado no cambia durante READINESS_QUIET[phase]
+    segundos (y cumple ready, si se indica) o se llega a READINESS[phase].
+    Devuelve el último resultado y acumula el tiempo esperado en la fase."""
+    start = time.perf_counter()
+    value = driver.execute_script(script)
+    changed_at = start
+    while True:
+        now = time.perf_counter()
+        if now - start >= READINESS[phase]:
+            break
+        if now - changed_at >= READINESS_QUIET[phase] and (ready is None or ready(value)):
+            break
+        time.sleep(READINESS_POLL)
+        new_value = driver.execute_script(script)
+        if new_value != value:
+            value = new_value
+            changed_at = time.perf_counter()
+    waited = _waits.setdefault(phase, [0.0, 0])
+    waited[0] += time.perf_counter() - start
+    waited[1] += 1
+    return value
+
+def format_waits(waits):
+    """'carga 1.2s (fijo 5s) | ...' con el ahorro frente a los sleep fijos"""
+    labels = {'page': 'carga', 'scroll': 'scroll', 'rows': 'filas de jugadores'}
+    parts = []
+    saved = 0.0
+    for phase, (seconds, count) in waits.items():
+        fixed = FIXED_SLEEPS[phase] * count
+        saved += fixed - seconds
+        parts.append(f"{labels[phase]} {seconds:.1f}s (fijo {fixed:.0f}s)")
+    return f"{' | '.join(parts)} — ahorro {saved:.1f}s"
+
+# ---------------------------------------------------------------------------
+# Índice de estado de los partidos
+#
+# Junto a match_urls_<liga>_<temporada>.txt se guarda fixtures_<liga>_<temporada>.json
+# con la fecha y el estado de cada partido tal como aparecen en el calendario, para
+# que la fase de datos no espere 50s de WebDriverWait en partidos aún sin jugar.
+# ---------------------------------------------------------------------------
+
+# Recoge en una sola llamada los enlaces a partidos con la fila del calendario en
+# la que están y la fecha más cercana (la de la propia fila o la de la cabecera
+# anterior). Argumento: DATE_PATTERNS.
+FIXTURES_JS = r"""
+const dateRes = arguments[0].map(pattern => new RegExp(pattern, 'i'));
+function findDate(text) {
+    for (const re of dateRes) {
+        const match = text.match(re);
+        if (match) return match[0];
+    }
+    return null;
+}
+const fixtures = [];
+for (const link of document.querySelectorAll('a[href*="/match/view/"]')) {
+    const row = link.closest('tr') || link.parentElement || link;
+    let dateText = null;
+    let el = row;
+    for (let steps = 0; el && !dateText && steps < 200; steps++) {
+        dateText = findDate(el.textContent);
+        let prev = el.previousElementSibling;
+        while (!prev && el.parentElement) {
+            el = el.parentElement;
+            prev = el.previousElementSibling;
+        }
+        el = prev;
+    }
+    fixtures.push({href: link.href, date: dateText,
+                   row: row.textContent.replace(/\s+/g, ' ').trim().slice(0, 300)});
+}
+return fixtures;
+"""
 
-    url = league_config['url']
+# Estado de un partido según el texto de su fila del calendario (en este orden)
+FIXTURE_STATUS_PATTERNS = [
+    ('postponed', r'\b(?:Postponed|Aplazado|Suspended)\b'),
+    ('cancelled', r'\b(?:Cancelled|Canceled|Abandoned)\b'),
+    ('final', r'\b(?:FT|AET|Pens?|Full[ -]?time)\b|\d+\s*[-–]\s*\d+'),
+    ('scheduled', r'\b\d{1,2}:\d{2}\b|\bvs?\b'),
+]
+
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+def fixture_status(row_text):
+    """'final', 'scheduled', 'postponed', 'cancelled' o None si no se reconoce"""
+    for status, pattern in FIXTURE_STATUS_PATTERNS:
+        if re.search(pattern, row_text or '', re.IGNORECASE):
+            return status
+    return None
+
+def parse_match_date(text):
+    """Fecha ISO (YYYY-MM-DD) de un texto con formato de DATE_PATTERNS, o None"""
+    match = re.search(r'(\d{1,2})\s+([a-z]+)\s+(\d{4})', text or '', re.IGNORECASE)
+    if match:
+        day, month, year = match.groups()
+    else:
+        match = re.search(r'([a-z]+)\s+(\d{1,2}),?\s+(\d{4})', text or '', re.IGNORECASE)
+        if not match:
+            return None
+        month, day, year = match.groups()
+    if month[:3].lower() not in MONTHS:
+        return None
+    try:
+        return date(int(year), MONTHS.index(month[:3].lower()) + 1, int(day)).isoformat()
+    except ValueError:
+        return None
 
-    driver = setup_driver()
-    print(f"\nCargando: {url}")
-    driver.get(url)
-    time.sleep(5)
+def load_fixtures(fixtures_file):
+    """Índice {id_partido: {'url', 'date', 'status', 'checked'}} (vacío si no existe)"""
+    try:
+        with open(fixtures_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_fixtures(fixtures_file, fixtures):
+    ensure_parent_dir(fixtures_file)
+    tmp_file = fixtures_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f, indent=1, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_file, fixtures_file)
+
+def fixture_pending_reason(fixture, today=None):
+    """Motivo para no extraer todavía un partido según el índice, o None.
+
+    Se saltan los partidos de hoy o de fechas futuras que no estén terminados y
+    los aplazados/cancelados comprobados ya en su fecha o después. Lo demás se
+    extrae (un 'scheduled' con fecha pasada ya se habrá jugado).
+    """
+    if not fixture or fixture.get('status') == 'final':
+        return None
+    today = (today or date.today()).isoformat()
+    kickoff = fixture.get('date')
+    if kickoff and kickoff >= today:
+        return 'sin jugar'
+    if kickoff and fixture.get('status') in ('postponed', 'cancelled') and fixture.get('checked', '') >= kickoff:
+        return 'aplazado' if fixture['status'] == 'postponed' else 'cancelado'
+    return None
+
+def read_match_urls(urls_file):
+    """URLs de un archivo match_urls (lista vacía si no existe)"""
+    try:
+        with open(urls_file, 'r') as f:
+            return [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        return []
+
+# Todas las URLs de partido de la página, en una sola llamada
+MATCH_LINKS_JS = "return Array.from(document.querySelectorAll('a[href*=\"/match/view/\"]'), a => a.href);"
+
+def extract_urls(league_config, verbose=True, options=None, delta=False):
+    """Extrae URLs de todos los partidos.
+
+    Con verbose=False solo se muestra el resultado final (para ejecutar varias
+    ligas a la vez sin mezclar su progreso en pantalla). De options (ver
+    EXTRACTION_DEFAULTS) se usan los máximos de espera y la configuración de Chrome.
+
+    Con delta=True se parte de las URLs ya guardadas: se deja de hacer scroll en
+    cuanto un scroll solo muestra partidos conocidos y las URLs nuevas se añaden
+    al final del archivo (las existentes no se mueven, así su 'Aux' no cambia).
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    options = extraction_options(options)
+    set_readiness(options['readiness'])
+    take_waits()
+    log("="*80)
+    log(f"EXTRAYENDO URLs DE PARTIDOS - {league_config['name']} {league_config['season']}")
+    log("="*80)
+
+    url = league_config['url']
+    known_urls = read_match_urls(league_config['urls_file']) if delta else []
+    known_ids = {match_id_from_url(known) for known in known_urls}
+    if known_urls:
+        log(f"Modo delta: {len(known_urls)} partidos ya conocidos")
+
+    set_profiling(options['profile'])
+    with profile_phase('urls_setup'):
+        driver = setup_driver(blocking=options['blocking'],
+                              cache_dir=chrome_cache_dir(f"urls_{league_config['key']}") if options['disk_cache'] else None)
+    log(f"\nCargando: {url}")
+    with profile_phase('urls_get'):
+        driver.get(url)
+        wait_until_stable(driver, 'page', PAGE_STATE_JS, ready=lambda state: state[0] == 'complete')
 
     # Scroll para cargar contenido dinámico
-    print("Haciendo scroll...")
-    last_height = driver.execute_script("return document.body.scrollHeight")
+    log("Haciendo scroll...")
+    last_state = driver.execute_script(SCROLL_STATE_JS)
+    seen_ids = {match_id_from_url(href) for href in driver.execute_script(MATCH_LINKS_JS)} if known_ids else set()
     no_change_count = 0
     max_scrolls = 30  # Aumentado de 5 a 30
     scroll_count = 0
     
     while scroll_count < max_scrolls and no_change_count < 3:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        
-        if new_height == last_height:
+        with profile_phase('urls_scroll'):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            new_state = wait_until_stable(driver, 'scroll', SCROLL_STATE_JS)
+
+        # Sin cambios: ni más altura ni más enlaces a partidos
+        if new_state[:2] == last_state[:2]:
             no_change_count += 1
-            print(f"  Sin cambios ({no_change_count}/3)")
+            log(f"  Sin cambios ({no_change_count}/3)")
         else:
             no_change_count = 0
-            print(f"  Contenido cargado (scroll {scroll_count + 1})")
+            log(f"  Contenido cargado (scroll {scroll_count + 1})")
+            if known_ids:
+                ids = {match_id_from_url(href) for href in driver.execute_script(MATCH_LINKS_JS)}
+                new_ids = ids - seen_ids
+                seen_ids |= ids
+                if new_ids and new_ids <= known_ids:
+                    log("  Solo partidos ya conocidos: no hace falta seguir")
+                    scroll_count += 1
+                    break
         
-        last_height = new_height
+        last_state = new_state
         scroll_count += 1
     
-    print(f"Scroll completado después de {scroll_count} intentos")
+    log(f"Scroll completado después de {scroll_count} intentos")
 
-    # Buscar URLs
-    all_links = driver.find_elements(By.TAG_NAME, "a")
+    # Buscar URLs (con la fecha y el estado de cada partido)
     match_urls = set()
+    previous_fixtures = load_fixtures(league_config['fixtures_file'])
+    fixtures = dict(previous_fixtures) if delta else {}
+    checked = date.today().isoformat()
+    now = datetime.now().isoformat(timespec='seconds')
     pattern = re.compile(r'/match/view/[a-z0-9]+')
 
-    for link in all_links:
-        href = link.get_attribute("href")
-        if href and pattern.search(href):
-            match_urls.add(href)
+    with profile_phase('urls_links'):
+        links = driver.execute_script(FIXTURES_JS, DATE_PATTERNS)
+    for link in links:
+        href = link['href']
+        if not (href and pattern.search(href)):
+            continue
+        match_urls.add(href)
+        match_id = match_id_from_url(href)
+        fixture = {'url': href, 'date': parse_match_date(link['date']),
+                   'status': fixture_status(link['row']), 'checked': checked,
+                   'first_seen': previous_fixtures.get(match_id, {}).get('first_seen', now)}
+        # Un partido puede tener varios enlaces: nos quedamos con el más completo
+        previous = fixtures.get(match_id)
+        if previous is None or previous.get('checked') != checked or \
+                (not previous['date'] and fixture['date']) or (not previous['status'] and fixture['status']):
+            fixtures[match_id] = fixture
 
     match_urls = sorted(list(match_urls))
     driver.quit()
+    save_fixtures(league_config['fixtures_file'], fixtures)
+    write_profile({'kind': 'urls', 'league': league_config['key'], 'season': league_config['season'],
+                   'scrolls': scroll_count, 'links': len(match_urls), 'phases': take_phases()})
 
     # Guardar URLs
     ensure_parent_dir(league_config['urls_file'])
-    with open(league_config['urls_file'], 'w') as f:
-        for url in match_urls:
-            f.write(url + '\n')
-
-    if not match_urls:
-        print(f"\n⚠️ No se encontró ningún partido de {league_config['name']} {league_config['season']}.")
-        print("   Es normal si la temporada todavía no ha empezado.\n")
+    if known_urls:
+        new_urls = [url for url in match_urls if match_id_from_url(url) not in known_ids]
+        with open(league_config['urls_file'], 'a') as f:
+            for url in new_urls:
+                f.write(url + '\n')
+        match_urls = known_urls + new_urls
+    else:
+        with open(league_config['urls_file'], 'w') as f:
+            for url in match_urls:
+                f.write(url + '\n')
+
+    waits = f"   ⏱️ Esperas: {format_waits(take_waits())}"
+    if known_urls:
+        print(f"\n✓ {league_config['name']}: {len(new_urls)} URLs nuevas añadidas a {league_config['urls_file']} "
+              f"({len(known_urls)} ya conocidas)\n{waits}\n")
+    elif not match_urls:
+        print(f"\n⚠️ No se encontró ningún partido de {league_config['name']} {league_config['season']}.\n"
+              f"   Es normal si la temporada todavía no ha empezado.\n{waits}\n")
     else:
-        print(f"\n✓ {len(match_urls)} URLs guardadas en: {league_config['urls_file']}\n")
+        print(f"\n✓ {league_config['name']}: {len(match_urls)} URLs guardadas en: {league_config['urls_file']}\n"
+              f"{waits}\n")
     return match_urls
 
-def extract_match_data(driver, url, match_number):
-    """Extrae datos de un partido"""
-    driver.get(url)
-    
+def extract_urls_parallel(league_configs, workers=None, options=None, delta=False):
+    """Extrae las URLs de varias ligas a la vez, un Chrome por liga"""
+    if len(league_configs) == 1:
+        extract_urls(league_configs[0], options=options, delta=delta)
+        return
+
+    max_workers = min(len(league_configs), workers or 8)
+    print("="*80)
+    print(f"EXTRAYENDO URLs DE {len(league_configs)} COMPETICIONES EN PARALELO ({max_workers} a la vez)")
+    print("="*80)
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(extract_urls, league_config, False, options, delta): league_config
+                   for league_config in league_configs}
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as exc:
+                print(f"\n❌ {futures[future]['name']}: error extrayendo URLs: {exc}")
+
+# ---------------------------------------------------------------------------
+# Errores de extracción
+#
+# Cada fallo de un partido se clasifica para decidir si se reintenta: los
+# transitorios (timeouts, Chrome caído, página a medias) vuelven a la cola al
+# final de la ejecución con un driver nuevo; los permanentes no.
+# ---------------------------------------------------------------------------
+
+class MatchError(Exception):
+    """Fallo al extraer un partido. kind lo clasifica y transient indica si
+    tiene sentido reintentarlo"""
+    kind = 'desconocido'
+    transient = True
+
+class HeaderTimeout(MatchError):
+    """El header del partido no apareció (página que no carga)"""
+    kind = 'timeout_header'
+
+class NoPlayerTables(MatchError):
+    """Hay header pero no llegaron las tablas de jugadores"""
+    kind = 'sin_tablas'
+
+class DriverCrash(MatchError):
+    """Chrome o chromedriver dejaron de responder"""
+    kind = 'driver'
+
+class NotPlayed(MatchError):
+    """El partido aún no se ha jugado (o está aplazado): no hay nada que extraer"""
+    kind = 'sin_jugar'
+    transient = False
+
+class ParseError(MatchError):
+    """La página cargó pero no se pudo extraer (reintentar daría lo mismo)"""
+    kind = 'parseo'
+    transient = False
+
+def classify_error(exc):
+    """MatchError equivalente a una excepción cualquiera de la extracción"""
+    if isinstance(exc, MatchError):
+        return exc
+    if isinstance(exc, WebDriverException) and not isinstance(exc, TimeoutException):
+        return DriverCrash(f"{type(exc).__name__}: {str(exc).strip().splitlines()[0] if str(exc).strip() else ''}")
+    return MatchError(f"{type(exc).__name__}: {str(exc)}")
+
+# Máximo (segundos) para que aparezcan el header del partido y, tras él, las tablas
+HEADER_TIMEOUT = 30
+PLAYERS_TIMEOUT = 20
+
+def missing_tables_error(header):
+    """Error de un partido cuyo header (texto) apareció pero no las tablas"""
+    if fixture_status(header) in ('scheduled', 'postponed', 'cancelled'):
+        return NotPlayed(f"Partido sin jugar: {' '.join(header.split())[:80]}")
+    return NoPlayerTables("Timeout esperando las tablas de jugadores")
+
+def wait_for_match_page(driver, url):
+    """Abre un partido y espera a que carguen el header y las tablas de jugadores"""
+    with profile_phase('get'):
+        driver.get(url)
+    wait_for_match_widgets(driver)
+
+def wait_for_match_widgets(driver):
+    """Espera a que el widget del partido abierto pinte el header y las tablas"""
     # Esperar a que cargue el contenido dinámico (header del partido)
     try:
-        WebDriverWait(driver, 30).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "Opta-MatchHeader"))
-        )
-        # Esperar también a que haya al menos una tabla de jugadores
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "Opta-Player"))
-        )
-        time.sleep(1)
-    except Exception as e:
-        raise Exception(f"Timeout esperando carga de página: {str(e)}")
+        with profile_phase('wait_header'):
+            WebDriverWait(driver, HEADER_TIMEOUT).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "Opta-MatchHeader"))
+            )
+    except TimeoutException:
+        raise HeaderTimeout("Timeout esperando el header del partido")
+
+    # Esperar también a que haya al menos una tabla de jugadores
+    try:
+        with profile_phase('wait_players'):
+            WebDriverWait(driver, PLAYERS_TIMEOUT).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "Opta-Player"))
+            )
+    except TimeoutException:
+        # Sin tablas: si el header dice que no se ha jugado no hay nada que esperar
+        raise missing_tables_error(driver.find_element(By.CLASS_NAME, "Opta-MatchHeader").text)
+
+    # Y a que se terminen de pintar todas las filas
+    with profile_phase('wait_rows'):
+        wait_until_stable(driver, 'rows', ROWS_STATE_JS)
+
+def load_match_page(driver, url):
+    """Abre un partido y devuelve su HTML renderizado"""
+    wait_for_match_page(driver, url)
+    with profile_phase('page_source'):
+        return driver.page_source
+
+def load_match_snapshot(driver, url):
+    """Abre un partido y devuelve solo los datos que necesita build_match_result,
+    extraídos dentro del navegador con un único execute_script (ver
+    MATCH_SNAPSHOT_JS) en vez de serializar todo el DOM"""
+    wait_for_match_page(driver, url)
+    return read_match_snapshot(driver)
+
+def read_match_snapshot(driver):
+    """Instantánea (MATCH_SNAPSHOT_JS) del partido ya cargado en el driver"""
+    with profile_phase('snapshot'):
+        return driver.execute_script(MATCH_SNAPSHOT_JS, DATE_PATTERNS, JORNADA_PATTERN)
+
+def load_match_feed(driver, url, timeout=None):
+    """Abre un partido y devuelve {'feed': ..., 'feed_url': ...} con el feed
+    matchstats leído del log de red de Chrome (driver creado con
+    setup_driver(capture_network=True)) y la URL de la que vino.
+
+    Si el feed no aparece en timeout segundos, o no trae jugadores, espera al
+    widget como siempre y devuelve la instantánea de load_match_snapshot.
+    """
+    match_id = match_id_from_url(url)
+    driver.get_log('performance')  # descartar los eventos de la página anterior
+    with profile_phase('get'):
+        driver.get(url)
+
+    feed_requests = {}  # requestId -> url
+    deadline = time.time() + (FEED_WAIT if timeout is None else timeout)
+    while time.time() < deadline:
+        for entry in driver.get_log('performance'):
+            event = json.loads(entry['message'])['message']
+            params = event.get('params', {})
+            if event.get('method') == 'Network.responseReceived':
+                feed_url = params.get('response', {}).get('url', '')
+                if FEED_URL_PATTERN.search(feed_url):
+                    feed_requests[params['requestId']] = feed_url
+            elif event.get('method') == 'Network.loadingFinished' and params.get('requestId') in feed_requests:
+                try:
+                    response = driver.execute_cdp_cmd('Network.getResponseBody',
+                                                      {'requestId': params['requestId']})
+                except Exception:
+                    continue
+                body = response.get('body', '')
+                if response.get('base64Encoded'):
+                    body = base64.b64decode(body).decode('utf-8')
+                feed = decode_feed(body)
+                if feed and feed_has_players(feed, match_id):
+                    return {'feed': feed, 'feed_url': feed_requests[params['requestId']]}
+        time.sleep(0.2)
+
+    wait_for_match_widgets(driver)
+    return driver.execute_script(MATCH_SNAPSHOT_JS, DATE_PATTERNS, JORNADA_PATTERN)
+
+def extract_match_data(driver, url, match_number):
+    """Extrae datos de un partido"""
+    return parse_match_page(load_match_page(driver, url), url, match_number)
+
+# ---------------------------------------------------------------------------
+# Lectura de la página de un partido
+#
+# build_match_result contiene toda la lógica de extracción (equipos, fecha,
+# tablas...) y lee la página a través de un objeto con los métodos de
+# SoupMatchPage, así los distintos backends producen exactamente las mismas filas.
+# ---------------------------------------------------------------------------
+
+class SoupMatchPage:
+    """Página de un partido leída con BeautifulSoup (html.parser)"""
+
+    def __init__(self, html):
+        self.soup = BeautifulSoup(html, 'html.parser')
+
+    def referee(self):
+        """Texto del <dd> que sigue al <dt>Referee</dt> (o None)"""
+        referee_element = self.soup.find('dt', string='Referee')
+        if referee_element and referee_element.find_next_sibling('dd'):
+            return referee_element.find_next_sibling('dd').text.strip()
+        return None
+
+    def team_name_texts(self):
+        """Textos de los elementos con clase Opta-Team-Name"""
+        return [el.get_text(strip=True) for el in self.soup.find_all(class_='Opta-Team-Name')]
+
+    def team_link_texts(self):
+        """Textos de los enlaces a equipos o de filtro (href con /team/ o clase filter)"""
+        texts = []
+        for link in self.soup.find_all('a', href=True):
+            href = link.get('href', '')
+            # Links de filtro suelen tener el team ID en el href
+            if '/team/' in href or 'filter' in link.get('class', []):
+                texts.append(link.get_text(strip=True))
+        return texts
+
+    def header_text(self):
+        """Texto del header del partido (o None si no hay header)"""
+        header = self.soup.find(class_='Opta-MatchHeader')
+        if header:
+            return header.get_text(" ", strip=True)
+        return None
+
+    def image_alts(self):
+        return [img.get('alt', '') for img in self.soup.find_all('img', alt=True)]
+
+    def page_text(self):
+        """Texto visible de toda la página"""
+        return self.soup.get_text(" ", strip=True)
+
+    def player_tables(self):
+        """Tablas que contienen jugadores (th.Opta-Player), en orden.
+
+        Cada tabla es {'headers': [...] o None si no tiene <thead>,
+        'rows': [(jugador o None, [valores])] o None si no tiene <tbody>}, con
+        jugador = texto del th.Opta-Player de la fila y cada valor = data-srt o
+        texto de sus td.Opta-Stat.
+        """
+        tables = []
+        for table in self.soup.find_all('table'):
+            if not table.find('th', class_='Opta-Player'):
+                continue
+
+            headers = None
+            thead = table.find('thead')
+            if thead:
+                headers = []
+                header_row = thead.find('tr')
+                if header_row:
+                    for th in header_row.find_all('th'):
+                        abbr = th.find('abbr')
+                        headers.append(abbr.get('title') if abbr and abbr.get('title') else th.text.strip())
+
+            rows = None
+            tbody = table.find('tbody')
+            if tbody:
+                rows = []
+                for row in tbody.find_all('tr'):
+                    player_th = row.find('th', class_='Opta-Player')
+                    if not player_th:
+                        rows.append((None, []))
+                        continue
+                    stats = [cell.get('data-srt', cell.text.strip())
+                             for cell in row.find_all('td', class_='Opta-Stat')]
+                    rows.append((player_th.text.strip(), stats))
+
+            tables.append({'headers': headers, 'rows': rows})
+        return tables
+
+
+# Etiquetas cuyo texto BeautifulSoup no considera texto de la página
+_LXML_SKIP_TEXT = {'script', 'style', 'template', 'rt', 'rp'}
+
+def _lxml_class_xpath(cls):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+def _lxml_strings(el):
+    """Cadenas de texto de un elemento en el mismo orden y con los mismos
+    criterios que BeautifulSoup (sin comentarios ni scripts/estilos)"""
+    if not isinstance(el.tag, str) or el.tag in _LXML_SKIP_TEXT:
+        return
+    if el.text:
+        yield el.text
+    for child in el:
+        yield from _lxml_strings(child)
+        if child.tail:
+            yield child.tail
+
+def _lxml_text(el, separator="", strip=False):
+    """Equivalente a get_text(separator, strip) de BeautifulSoup"""
+    strings = _lxml_strings(el)
+    if strip:
+        strings = (text.strip() for text in strings)
+        strings = (text for text in strings if text)
+    return separator.join(strings)
+
+def _lxml_string(el):
+    """Equivalente a Tag.string de BeautifulSoup: el texto si el elemento tiene
+    un único hijo de texto (descendiendo por hijos únicos), si no None"""
+    children = list(el)
+    if el.text and not children:
+        return el.text
+    if not el.text and len(children) == 1 and not children[0].tail:
+        child = children[0]
+        if not isinstance(child.tag, str):
+            return child.text
+        return _lxml_string(child)
+    return None
+
+class LxmlMatchPage:
+    """Página de un partido leída con lxml (XPath sobre las clases de Opta).
+
+    Mismos métodos y resultados que SoupMatchPage, bastante más rápido.
+    """
+
+    PLAYER_TH = f".//th[{_lxml_class_xpath('Opta-Player')}]"
+
+    def __init__(self, html):
+        self.root = lxml.html.document_fromstring(html)
+
+    def referee(self):
+        for dt in self.root.iter('dt'):
+            if _lxml_string(dt) == 'Referee':
+                dd = next(dt.itersiblings('dd'), None)
+                return _lxml_text(dd).strip() if dd is not None else None
+        return None
+
+    def team_name_texts(self):
+        return [_lxml_text(el, strip=True)
+                for el in self.root.xpath(f"//*[{_lxml_class_xpath('Opta-Team-Name')}]")]
+
+    def team_link_texts(self):
+        return [_lxml_text(link, strip=True) for link in self.root.xpath('//a[@href]')
+                if '/team/' in link.get('href') or 'filter' in (link.get('class') or '').split()]
+
+    def header_text(self):
+        headers = self.root.xpath(f"//*[{_lxml_class_xpath('Opta-MatchHeader')}]")
+        return _lxml_text(headers[0], " ", strip=True) if headers else None
 
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    match_id = re.search(r'/match/view/([a-z0-9]+)', url).group(1)
+    def image_alts(self):
+        return [img.get('alt') for img in self.root.xpath('//img[@alt]')]
+
+    def page_text(self):
+        return _lxml_text(self.root, " ", strip=True)
+
+    def player_tables(self):
+        tables = []
+        for table in self.root.iter('table'):
+            if not table.xpath(self.PLAYER_TH):
+                continue
+
+            headers = None
+            thead = table.find('.//thead')
+            if thead is not None:
+                headers = []
+                header_row = thead.find('.//tr')
+                if header_row is not None:
+                    for th in header_row.iter('th'):
+                        abbr = th.find('.//abbr')
+                        title = abbr.get('title') if abbr is not None else None
+                        headers.append(title if title else _lxml_text(th).strip())
+
+            rows = None
+            tbody = table.find('.//tbody')
+            if tbody is not None:
+                rows = []
+                for row in tbody.iter('tr'):
+                    player_th = row.xpath(self.PLAYER_TH)
+                    if not player_th:
+                        rows.append((None, []))
+                        continue
+                    stats = []
+                    for cell in row.xpath(f".//td[{_lxml_class_xpath('Opta-Stat')}]"):
+                        value = cell.get('data-srt')
+                        stats.append(value if value is not None else _lxml_text(cell).strip())
+                    rows.append((_lxml_text(player_th[0]).strip(), stats))
+
+            tables.append({'headers': headers, 'rows': rows})
+        return tables
+
+
+# Extracción dentro del navegador: un único execute_script recorre la página y
+# devuelve solo lo que lee build_match_result (los mismos métodos que
+# SoupMatchPage) en vez de pasar todo el DOM por WebDriver y parsearlo en Python.
+# Argumentos: DATE_PATTERNS y JORNADA_PATTERN. Del texto de la página solo se
+# devuelven los fragmentos que encuentran esos patrones.
+MATCH_SNAPSHOT_JS = r"""
+const datePatterns = arguments[0];
+const jornadaPattern = arguments[1];
+// Etiquetas cuyo texto BeautifulSoup no considera texto de la página
+const SKIP = new Set(['SCRIPT', 'STYLE', 'TEMPLATE', 'RT', 'RP']);
+
+function strings(node, out) {
+    for (const child of node.childNodes) {
+        if (child.nodeType === 3) {
+            out.push(child.data);
+        } else if (child.nodeType === 1 && !SKIP.has(child.tagName.toUpperCase())) {
+            strings(child, out);
+        }
+    }
+    return out;
+}
+function text(el) {
+    return strings(el, []).join('');
+}
+function strippedText(el, separator) {
+    return strings(el, []).map(s => s.trim()).filter(s => s).join(separator);
+}
+// Equivalente a Tag.string de BeautifulSoup
+function onlyString(el) {
+    if (el.childNodes.length !== 1) return null;
+    const child = el.childNodes[0];
+    if (child.nodeType === 1) return onlyString(child);
+    return child.data;
+}
+function hasClass(el, cls) {
+    return (el.getAttribute('class') || '').split(/\s+/).includes(cls);
+}
+function findAll(root, tag, cls) {
+    return Array.from(root.getElementsByTagName(tag)).filter(el => !cls || hasClass(el, cls));
+}
+function find(root, tag, cls) {
+    return findAll(root, tag, cls)[0] || null;
+}
+
+let referee = null;
+const refereeDt = findAll(document, 'dt').find(dt => onlyString(dt) === 'Referee');
+if (refereeDt) {
+    let dd = refereeDt.nextElementSibling;
+    while (dd && dd.tagName.toUpperCase() !== 'DD') dd = dd.nextElementSibling;
+    referee = dd ? text(dd).trim() : null;
+}
+
+const teamLinkTexts = [];
+for (const link of findAll(document, 'a')) {
+    const href = link.getAttribute('href');
+    if (href !== null && (href.includes('/team/') || hasClass(link, 'filter'))) {
+        teamLinkTexts.push(strippedText(link, ''));
+    }
+}
+
+const header = document.getElementsByClassName('Opta-MatchHeader')[0];
+
+const pageText = strippedText(document.documentElement, ' ');
+const hits = [];
+for (const pattern of datePatterns.concat([jornadaPattern])) {
+    const match = pageText.match(new RegExp(pattern, 'i'));
+    if (match) hits.push(match[0]);
+}
+
+const tables = [];
+for (const table of findAll(document, 'table')) {
+    if (!find(table, 'th', 'Opta-Player')) continue;
+
+    let headers = null;
+    const thead = find(table, 'thead');
+    if (thead) {
+        headers = [];
+        const headerRow = find(thead, 'tr');
+        if (headerRow) {
+            for (const th of findAll(headerRow, 'th')) {
+                const abbr = find(th, 'abbr');
+                const title = abbr ? abbr.getAttribute('title') : null;
+                headers.push(title ? title : text(th).trim());
+            }
+        }
+    }
+
+    let rows = null;
+    const tbody = find(table, 'tbody');
+    if (tbody) {
+        rows = [];
+        for (const row of findAll(tbody, 'tr')) {
+            const playerTh = find(row, 'th', 'Opta-Player');
+            if (!playerTh) {
+                rows.push([null, []]);
+                continue;
+            }
+            const stats = findAll(row, 'td', 'Opta-Stat').map(cell => {
+                const value = cell.getAttribute('data-srt');
+                return value !== null ? value : text(cell).trim();
+            });
+            rows.push([text(playerTh).trim(), stats]);
+        }
+    }
+    tables.push({headers: headers, rows: rows});
+}
+
+return {
+    referee: referee,
+    team_name_texts: Array.from(document.getElementsByClassName('Opta-Team-Name'), el => strippedText(el, '')),
+    team_link_texts: teamLinkTexts,
+    header_text: header ? strippedText(header, ' ') : null,
+    image_alts: findAll(document, 'img').filter(img => img.getAttribute('alt') !== null)
+                                       .map(img => img.getAttribute('alt')),
+    page_text: hits.join(' | '),
+    player_tables: tables
+};
+"""
+
+class SnapshotMatchPage:
+    """Página de un partido ya extraída en el navegador (ver MATCH_SNAPSHOT_JS).
+
+    page_text() no es el texto completo sino los fragmentos que encontraron
+    DATE_PATTERNS y JORNADA_PATTERN, suficiente para build_match_result.
+    """
+
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def referee(self):
+        return self.snapshot['referee']
+
+    def team_name_texts(self):
+        return self.snapshot['team_name_texts']
+
+    def team_link_texts(self):
+        return self.snapshot['team_link_texts']
+
+    def header_text(self):
+        return self.snapshot['header_text']
+
+    def image_alts(self):
+        return self.snapshot['image_alts']
+
+    def page_text(self):
+        return self.snapshot['page_text']
+
+    def player_tables(self):
+        return self.snapshot['player_tables']
+
+
+PAGE_BACKENDS = {
+    'bs4': SoupMatchPage,
+    'lxml': LxmlMatchPage,
+}
+
+def parse_match_page(html, url, match_number, parser='bs4'):
+    """Extrae los datos de un partido de su HTML renderizado (sin navegador)"""
+    with profile_phase('dom'):
+        page = PAGE_BACKENDS[parser](html)
+    return build_match_result(page, url, match_number)
+
+def parse_match_payload(payload, url, match_number, parser='bs4'):
+    """Extrae los datos de un partido de lo que devolvió el navegador: el HTML
+    (load_match_page), la instantánea de MATCH_SNAPSHOT_JS (load_match_snapshot)
+    o el feed de Opta (load_match_feed)"""
+    if isinstance(payload, dict) and 'feed' in payload:
+        return build_feed_result(payload['feed'], url, match_number)
+    if isinstance(payload, dict):
+        return build_match_result(SnapshotMatchPage(payload), url, match_number)
+    return parse_match_page(payload, url, match_number, parser)
+
+# Patrones de fecha:
+# 1. DD Month YYYY (e.g. 15 August 2024)
+# 2. Month DD, YYYY (e.g. August 15, 2024)
+# Se usan también como RegExp dentro del navegador (MATCH_SNAPSHOT_JS), así que
+# deben ser compatibles con JavaScript
+DATE_PATTERNS = [
+    r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}',
+    r'(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}'
+]
+
+# "Matchweek X", "Jornada X" o "Round X"
+JORNADA_PATTERN = r'(?:Matchweek|Jornada|Round)\s+(\d+)'
+
+def build_match_result(page, url, match_number):
+    """Construye las filas de jugadores de un partido a partir de su página
+    (cualquier objeto con los métodos de SoupMatchPage)"""
+    match_id = match_id_from_url(url)
+    phase_start = time.perf_counter()
 
     # Extraer árbitro
-    arbitro = ""
-    referee_element = soup.find('dt', string='Referee')
-    if referee_element and referee_element.find_next_sibling('dd'):
-        arbitro = referee_element.find_next_sibling('dd').text.strip()
+    arbitro = page.referee() or ""
 
 
     # Extraer equipos con estrategia múltiple
     team_names = []
     
     # Estrategia 1: Buscar elementos con clase Opta-Team-Name
-    name_elements = soup.find_all(class_='Opta-Team-Name')
-    for el in name_elements:
-        text = el.get_text(strip=True)
+    for text in page.team_name_texts():
         if text and text not in team_names and len(text) > 2:
             team_names.append(text)
     
     # Estrategia 2: Si no se encontraron, buscar en enlaces <a> del filtro de equipos
     if len(team_names) < 2:
-        # Buscar enlaces que contengan "filter" en su href o clase
-        filter_links = soup.find_all('a', href=True)
-        for link in filter_links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            # Links de filtro suelen tener el team ID en el href
-            if '/team/' in href or 'filter' in link.get('class', []):
-                if text and text not in team_names and len(text) > 2:
-                    # Evitar textos genéricos como "All", "Home", "Away"
-                    if text.lower() not in ['all', 'home', 'away', 'filter']:
-                        team_names.append(text)
+        for text in page.team_link_texts():
+            if text and text not in team_names and len(text) > 2:
+                # Evitar textos genéricos como "All", "Home", "Away"
+                if text.lower() not in ['all', 'home', 'away', 'filter']:
+                    team_names.append(text)
     
     # Estrategia 3: Buscar en el header del partido
     if len(team_names) < 2:
-        header = soup.find(class_='Opta-MatchHeader')
-        if header:
-            # Buscar todos los textos en el header que parezcan nombres de equipos
-            header_text = header.get_text(" ", strip=True)
+        # Buscar todos los textos en el header que parezcan nombres de equipos
+        header_text = page.header_text()
+        if header_text is not None:
             # Separar por el marcador (números separados por guiones o espacios)
             # Buscar patrón: "Equipo1 X - Y Equipo2" o "Equipo1 X Y Equipo2"
             score_pattern = r'(\d+)\s*[-:]\s*(\d+)'
@@ -386,8 +1389,7 @@ def extract_match_data(driver, url, match_number):
     
     # Estrategia 4: Buscar en imágenes (última opción)
     if len(team_names) < 2:
-        for img in soup.find_all('img', alt=True):
-            alt = img.get('alt', '')
+        for alt in page.image_alts():
             if alt and 'Opta' not in alt and len(alt) > 2 and alt not in team_names:
                 # Lista de palabras clave que suelen estar en nombres de equipos
                 team_keywords = ['cf', 'fc', 'club', 'united', 'city', 'athletic', 'real', 'sporting', 
@@ -432,22 +1434,15 @@ def extract_match_data(driver, url, match_number):
     
     equipo_local = clean_team_name(equipo_local)
     equipo_visitante = clean_team_name(equipo_visitante)
+    record_phase('teams', phase_start)
+    phase_start = time.perf_counter()
     
     # Extraer fecha
     fecha = ""
     # Buscar en todo el texto de la página
-    page_text = soup.get_text(" ", strip=True)
+    page_text = page.page_text()
     
-    # Patrones de fecha:
-    # 1. DD Month YYYY (e.g. 15 August 2024)
-    # 2. Month DD, YYYY (e.g. August 15, 2024)
-    # 3. DD/MM/YYYY
-    date_patterns = [
-        r'\d{1,2}\s+(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{4}',
-        r'(?:January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s+\d{1,2},?\s+\d{4}'
-    ]
-    
-    for pattern in date_patterns:
+    for pattern in DATE_PATTERNS:
         date_match = re.search(pattern, page_text, re.IGNORECASE)
         if date_match:
             fecha = date_match.group()
@@ -466,19 +1461,17 @@ def extract_match_data(driver, url, match_number):
     # Extraer jornada
     jornada = ""
     # Buscar "Matchweek X" o "Round X"
-    jornada_match = re.search(r'(?:Matchweek|Jornada|Round)\s+(\d+)', page_text, re.IGNORECASE)
+    jornada_match = re.search(JORNADA_PATTERN, page_text, re.IGNORECASE)
     if jornada_match:
         jornada = jornada_match.group(1)
+    record_phase('page_text', phase_start)
+    phase_start = time.perf_counter()
 
     # Extraer datos de jugadores
     players_data = []
-    tables = soup.find_all('table')
 
-    # Filtrar solo tablas de jugadores
-    candidate_tables = []
-    for table in tables:
-        if table.find('th', class_='Opta-Player'):
-            candidate_tables.append(table)
+    # Solo tablas de jugadores (con th.Opta-Player)
+    candidate_tables = page.player_tables()
             
     # Seleccionar las tablas correctas (Home y Away)
     # A veces hay tablas duplicadas (resumen vs detalle) para el mismo equipo
@@ -490,25 +1483,15 @@ def extract_match_data(driver, url, match_number):
         
         # Para la segunda tabla (visitante), buscamos una que tenga jugadores diferentes
         # Extraemos el primer jugador de la primera tabla para comparar
-        first_table_players = set()
-        tbody = candidate_tables[0].find('tbody')
-        if tbody:
-            for row in tbody.find_all('tr'):
-                th = row.find('th', class_='Opta-Player')
-                if th:
-                    first_table_players.add(th.text.strip())
+        first_table_players = {player for player, _ in candidate_tables[0]['rows'] or [] if player is not None}
         
-        for i in range(1, len(candidate_tables)):
-            current_table = candidate_tables[i]
+        for current_table in candidate_tables[1:]:
             # Verificar primer jugador de esta tabla
-            tbody = current_table.find('tbody')
-            if not tbody: continue
+            if current_table['rows'] is None: continue
             
             is_duplicate = False
-            for row in tbody.find_all('tr'):
-                th = row.find('th', class_='Opta-Player')
-                if th:
-                    player_name = th.text.strip()
+            for player_name, _ in current_table['rows']:
+                if player_name is not None:
                     if player_name in first_table_players:
                         is_duplicate = True
                     break # Solo comprobamos el primer jugador
@@ -519,39 +1502,26 @@ def extract_match_data(driver, url, match_number):
                 
     # Procesar las tablas seleccionadas
     for table_idx, table in enumerate(final_tables):
-        thead = table.find('thead')
-        if not thead:
+        headers = table['headers']
+        if headers is None:
             continue
 
-        # Headers
-        headers = []
-        header_row = thead.find('tr')
-        if header_row:
-            for th in header_row.find_all('th'):
-                abbr = th.find('abbr')
-                headers.append(abbr.get('title') if abbr and abbr.get('title') else th.text.strip())
-
         if not headers or all(h == '' for h in headers):
             continue
 
         equipo_jugador = equipo_local if table_idx == 0 else equipo_visitante
 
         # Filas de jugadores
-        tbody = table.find('tbody')
-        if not tbody:
+        if table['rows'] is None:
             continue
 
-        for row in tbody.find_all('tr'):
-            player_th = row.find('th', class_='Opta-Player')
-            if not player_th:
+        for jugador, stats in table['rows']:
+            if jugador is None:
                 continue
 
-            jugador = player_th.text.strip()
             if jugador.lower() in ['total', 'team total', 'equipo']:
                 continue
 
-            stats_cells = row.find_all('td', class_='Opta-Stat')
-
             player_data = {
                 'Aux': match_number,
                 'Fecha': fecha,
@@ -563,11 +1533,12 @@ def extract_match_data(driver, url, match_number):
                 'Jugador': jugador
             }
 
-            for i, cell in enumerate(stats_cells):
+            for i, value in enumerate(stats):
                 stat_name = headers[i + 1] if i + 1 < len(headers) else f'Stat_{i}'
-                player_data[stat_name] = cell.get('data-srt', cell.text.strip())
+                player_data[stat_name] = value
 
             players_data.append(player_data)
+    record_phase('tables', phase_start)
 
     # Retornar datos y metadatos del partido
     return {
@@ -578,51 +1549,1750 @@ def extract_match_data(driver, url, match_number):
         'match_number': match_number
     }
 
-def process_batch(batch_data, progress_counter=None, progress_lock=None):
-    """Procesa un lote de URLs con una única instancia del driver"""
-    batch_id, urls_with_indices = batch_data
-    
-    driver = setup_driver()
-    batch_results = []
-    failed_matches = []
-    
+# ---------------------------------------------------------------------------
+# Feed de datos de Opta
+#
+# El widget de estadísticas se rellena con el feed matchstats de la API de Opta
+# (api.performfeeds.com/soccerdata/matchstats/..., JSON o JSONP). Con
+# --extract feed se lee esa respuesta del log de red de Chrome en cuanto llega,
+# sin esperar a que se pinte el widget, y las filas se construyen directamente
+# del feed con los mismos nombres de columna que las tablas del widget.
+# ---------------------------------------------------------------------------
+
+FEED_URL_PATTERN = re.compile(r'/soccerdata/matchstats/')
+
+# Segundos máximos esperando el feed antes de volver a leer el DOM
+FEED_WAIT = 15
+
+# Columna de las tablas del widget -> tipo de estadística del feed
+FEED_STAT_COLUMNS = {
+    'Assists': 'goalAssist',
+    'Blocked shots': 'blockedScoringAtt',
+    'Corners won': 'wonCorners',
+    'Crosses': 'totalCross',
+    'Fouls conceded': 'fouls',
+    'Fouls won': 'wasFouled',
+    'Goals': 'goals',
+    'Offsides': 'totalOffside',
+    'Passes': 'totalPass',
+    'Red cards': 'redCard',
+    'Saves': 'saves',
+    'Shots': 'totalScoringAtt',
+    'Shots on target': 'ontargetScoringAtt',
+    'Tackles': 'totalTackle',
+    'Yellow cards': 'yellowCard',
+}
+
+def feed_has_players(feed, match_id):
+    """True si el feed es el del partido y trae jugadores en las alineaciones"""
+    if feed.get('matchInfo', {}).get('id') != match_id:
+        return False
+    return any(line_up.get('player') for line_up in feed.get('liveData', {}).get('lineUp') or [])
+
+def decode_feed(body):
+    """JSON del feed a partir del cuerpo de la respuesta (JSON o JSONP)"""
+    body = body.strip()
+    if not body.startswith('{'):
+        # JSONP: callback({...});
+        start, end = body.find('('), body.rfind(')')
+        if start == -1 or end <= start:
+            return None
+        body = body[start + 1:end]
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+def _feed_value(value):
+    """Valor numérico de una estadística del feed (vienen como texto)"""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return value
+
+def _feed_date(value):
+    """'2025-11-08Z' -> '8 Nov 2025' (el formato de la columna Fecha)"""
+    match = re.match(r'(\d{4})-(\d{2})-(\d{2})', value or '')
+    if not match:
+        return ""
+    return date(*map(int, match.groups())).strftime('%d %b %Y').lstrip('0')
+
+def build_feed_result(feed, url, match_number):
+    """Construye las filas de jugadores de un partido a partir de su feed
+    matchstats (mismo formato que build_match_result).
+
+    Devuelve None si el feed no trae alineaciones con estadísticas, para que
+    el partido se lea del DOM.
+    """
+    match_id = match_id_from_url(url)
+    match_info = feed.get('matchInfo', {})
+    live_data = feed.get('liveData', {})
+    line_ups = live_data.get('lineUp') or []
+    if not line_ups:
+        return None
+
+    teams = {}
+    for contestant in match_info.get('contestant', []):
+        teams[contestant.get('position')] = contestant
+    equipo_local = (teams.get('home') or {}).get('officialName') or (teams.get('home') or {}).get('name', "")
+    equipo_visitante = (teams.get('away') or {}).get('officialName') or (teams.get('away') or {}).get('name', "")
+    home_id = (teams.get('home') or {}).get('id')
+
+    arbitro = ""
+    for official in live_data.get('matchDetailsExtra', {}).get('matchOfficial', []):
+        if official.get('type') == 'Main':
+            arbitro = f"{official.get('firstName', '')} {official.get('lastName', '')}".strip()
+            break
+
+    fecha = _feed_date(match_info.get('date'))
+    jornada = str(match_info.get('week', ""))
+
+    if not hasattr(extract_match_data, 'quiet_mode') or not extract_match_data.quiet_mode:
+        print(f"[{match_number}] {fecha} | {equipo_local} vs {equipo_visitante}")
+
+    # Local primero, como las tablas del widget
+    line_ups = sorted(line_ups, key=lambda line_up: line_up.get('contestantId') != home_id)
+
+    players_data = []
+    for line_up in line_ups:
+        for player in line_up.get('player', []):
+            stats = {stat.get('type'): stat.get('value') for stat in player.get('stat', [])}
+            # El widget solo lista a los jugadores que han jugado
+            if not _feed_value(stats.get('minsPlayed', 0)):
+                continue
+            player_data = {
+                'Aux': match_number,
+                'Fecha': fecha,
+                'Jornada': jornada,
+                'ID_PARTIDO': match_id,
+                'Arbitro': arbitro,
+                'Equipo_local': equipo_local,
+                'Equipo_Visitante': equipo_visitante,
+                'Jugador': player.get('matchName') or f"{player.get('firstName', '')} {player.get('lastName', '')}".strip()
+            }
+            for column, stat_type in FEED_STAT_COLUMNS.items():
+                player_data[column] = _feed_value(stats.get(stat_type, 0))
+            players_data.append(player_data)
+
+    if not players_data:
+        return None
+    return {
+        'players': players_data,
+        'fecha': fecha,
+        'equipo_local': equipo_local,
+        'equipo_visitante': equipo_visitante,
+        'match_number': match_number
+    }
+
+def append_jsonl(path, record):
+    """Añade un registro a un archivo JSONL (journal, índice del archivo raw).
+
+    Se escribe la línea completa de una vez y se fuerza a disco, así un corte
+    de luz, un OOM-kill o un Ctrl-C como mucho dejan la última línea a medias.
+    """
+    line = json.dumps(record, ensure_ascii=False) + '\n'
+    ensure_parent_dir(path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+def load_jsonl(path):
+    """Registros de un archivo JSONL escrito con append_jsonl: {id: registro},
+    con el último registro de cada id.
+
+    Una última línea incompleta (escritura interrumpida) se ignora.
+    """
+    records = {}
+    if not os.path.exists(path):
+        return records
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[record['id']] = record
+    return records
+
+def load_journal(journal_file):
+    """Partidos terminados según el journal: {ID_PARTIDO: registro}.
+
+    Si la última línea quedó a medias ese partido simplemente se vuelve a extraer.
+    """
+    return load_jsonl(journal_file)
+
+def raw_page_path(digest):
+    return os.path.join(RAW_DIR, 'objects', digest[:2], f"{digest}.html.gz")
+
+def archive_raw_page(html):
+    """Guarda el HTML renderizado de un partido comprimido en el archivo raw.
+
+    El archivo es direccionable por contenido (nombre = sha256 del HTML), así
+    una página idéntica nunca se guarda dos veces. Devuelve el sha256.
+    """
+    data = html.encode('utf-8')
+    digest = hashlib.sha256(data).hexdigest()
+    path = raw_page_path(digest)
+    if not os.path.exists(path):
+        ensure_parent_dir(path)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(data, mtime=0))
+        os.replace(tmp_path, path)
+    return digest
+
+def load_raw_page(digest):
+    with open(raw_page_path(digest), 'rb') as f:
+        return gzip.decompress(f.read()).decode('utf-8')
+
+def close_journal_tail(journal_file):
+    """Termina con salto de línea un journal cortado a mitad de escritura, para
+    que el siguiente registro no se pegue a la línea incompleta"""
+    if not os.path.exists(journal_file) or os.path.getsize(journal_file) == 0:
+        return
+    with open(journal_file, 'rb+') as f:
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) != b'\n':
+            f.write(b'\n')
+
+def log_match_error(i, url, error_msg):
+    """Registra un partido fallido en logs/scraper_errors.log"""
+    ensure_parent_dir(ERROR_LOG_FILE)
+    with open(ERROR_LOG_FILE, 'a') as f:
+        f.write(f"Partido {i}: {url}\n")
+        f.write(f"Error: {error_msg}\n\n")
+
+class NoData(MatchError):
+    """La página cargó pero no salió ningún jugador"""
+    kind = 'sin_datos'
+
+class WorkerDied(MatchError):
+    """El proceso del worker que tenía el partido terminó sin devolverlo"""
+    kind = 'worker'
+
+def _fail_message(message, exc):
+    """Marca el mensaje de un partido como fallido, con el error clasificado"""
+    error = classify_error(exc)
+    error_msg = str(error) if type(error) is MatchError else f"{type(error).__name__}: {error}"
+    log_match_error(message['i'], message['url'], error_msg)
+    message.update(status='error', error=error_msg, kind=error.kind, transient=error.transient)
+
+def _parse_message(message, page, options):
+    """Parsea (y archiva, si se pide) la página de un partido (HTML o
+    instantánea de MATCH_SNAPSHOT_JS) y completa con el resultado el mensaje
+    que se devuelve al proceso principal"""
+    start = time.perf_counter()
+    i, url = message['i'], message['url']
+    try:
+        if options['archive_raw'] and isinstance(page, str):
+            message['raw'] = archive_raw_page(page)
+        result = parse_match_payload(page, url, i, options['parser'])
+        if result and result.get('players'):
+            message.update(status='ok', players=result['players'])
+        else:
+            _fail_message(message, NoData("No se extrajeron datos"))
+    except Exception as e:
+        _fail_message(message, e if isinstance(e, MatchError) else ParseError(f"{type(e).__name__}: {str(e)}"))
+    message['timings']['parse'] = time.perf_counter() - start
+    phases = take_phases()
+    if phases:
+        message.setdefault('phases', {}).update(phases)
+    return message
+
+# ---------------------------------------------------------------------------
+# Memoria de Chrome
+#
+# La memoria de Chrome crece página a página; los workers reinician su driver
+# cada recycle_pages partidos o cuando el árbol de procesos (chromedriver +
+# Chrome y sus renderers) pasa de max_rss_mb. Se mide con psutil si está
+# instalado y si no leyendo /proc (Linux).
+# ---------------------------------------------------------------------------
+
+def _proc_children():
+    """{pid: [pids de sus hijos]} leyendo /proc"""
+    children = {}
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open(f'/proc/{name}/stat', 'r') as f:
+                stat = f.read()
+            # El nombre del proceso va entre paréntesis y puede tener espacios
+            ppid = int(stat.rsplit(')', 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(name))
+    return children
+
+def _proc_rss(pid):
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+def process_tree_rss(pid):
+    """Memoria residente (bytes) de un proceso y todos sus descendientes"""
+    if psutil is not None:
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except psutil.Error:
+            return 0
+        total = 0
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    if not os.path.isdir('/proc'):
+        return 0
+    children = _proc_children()
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += _proc_rss(current)
+        stack.extend(children.get(current, []))
+    return total
+
+def driver_rss(driver):
+    """Memoria residente (bytes) de chromedriver y el Chrome que controla"""
+    process = getattr(getattr(driver, 'service', None), 'process', None)
+    return process_tree_rss(process.pid) if process else 0
+
+def recycle_reason(driver, pages, options):
+    """'pages' o 'rss' si hay que reiniciar el driver tras pages partidos, o None"""
+    if options['recycle_pages'] and pages >= options['recycle_pages']:
+        return 'pages'
+    if options['max_rss_mb'] and driver_rss(driver) > options['max_rss_mb'] * 1024 * 1024:
+        return 'rss'
+    return None
+
+# ---------------------------------------------------------------------------
+# Descarga directa por HTTP (--http-first)
+#
+# Antes de abrir Chrome se prueba una petición HTTP normal (sesión con pool de
+# conexiones): primero la propia página del partido, por si ya trae las tablas
+# de jugadores, y después el feed matchstats de Opta si se conoce su URL. La
+# plantilla de esa URL se aprende la primera vez que load_match_feed ve el feed
+# en el log de red (o se da con --feed-url) y se guarda en cache/. Solo si
+# ninguna de las dos trae jugadores se carga el partido en el navegador. Si lo
+# que trajo la petición no da jugadores al parsearlo, el partido vuelve a la
+# cola y esa vez va directo al navegador (HTTP solo se prueba en el primer intento).
+# ---------------------------------------------------------------------------
+
+HTTP_TIMEOUT = 10
+
+# Fila de jugador (th.Opta-Player) en el HTML servido; no basta con que el
+# nombre de la clase aparezca en cualquier sitio (estilos, scripts...)
+PLAYER_ROW_PATTERN = re.compile(r'<th\b[^>]*\bclass="(?:[^"]*\s)?Opta-Player(?:\s[^"]*)?"')
+FEED_URL_TEMPLATE_FILE = os.path.join(CACHE_DIR, 'opta_feed_url.json')
+
+def http_session(pool_size=4):
+    """Sesión de requests con pool de conexiones y las cabeceras de Chrome"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'User-Agent': USER_AGENT, 'Referer': BASE_URL + '/'})
+    return session
+
+def load_feed_url_template():
+    try:
+        with open(FEED_URL_TEMPLATE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f).get('template')
+    except (OSError, ValueError):
+        return None
+
+def save_feed_url_template(template):
+    ensure_parent_dir(FEED_URL_TEMPLATE_FILE)
+    # Varios workers pueden aprenderla a la vez: cada uno con su temporal
+    tmp_file = f"{FEED_URL_TEMPLATE_FILE}.{os.getpid()}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump({'template': template, 'learned': datetime.now().isoformat(timespec='seconds')}, f)
+    os.replace(tmp_file, FEED_URL_TEMPLATE_FILE)
+
+def feed_url_template(feed_url, match_id):
+    """Plantilla (con {match_id}) de la URL del feed de un partido, o None"""
+    if not match_id or match_id not in feed_url:
+        return None
+    return feed_url.replace('{', '{{').replace('}', '}}').replace(match_id, '{match_id}')
+
+def fetch_match_http(session, url, feed_template=None):
+    """Datos de un partido sin navegador: el HTML si ya trae las tablas de
+    jugadores o {'feed': ...} del feed de Opta. None si hay que abrir Chrome."""
+    response = session.get(url, timeout=HTTP_TIMEOUT)
+    if response.ok and PLAYER_ROW_PATTERN.search(response.text):
+        return response.text
+    match_id = match_id_from_url(url)
+    if feed_template and match_id:
+        response = session.get(feed_template.format(match_id=match_id), timeout=HTTP_TIMEOUT)
+        if response.ok:
+            feed = decode_feed(response.text)
+            if feed and feed_has_players(feed, match_id):
+                return {'feed': feed}
+    return None
+
+class HttpFetcher:
+    """Intento HTTP de un worker con http_first: su sesión y la plantilla
+    de la URL del feed"""
+
+    def __init__(self, template=None):
+        self.session = http_session()
+        self.template = template or load_feed_url_template()
+
+    def fetch(self, message):
+        """Datos del partido del mensaje por HTTP o None. Apunta en el mensaje
+        lo que tardó ('http') y, si acierta, source='http'."""
+        if self.template is None:
+            # Quizá otro worker ya la ha aprendido
+            self.template = load_feed_url_template()
+        start = time.perf_counter()
+        try:
+            page = fetch_match_http(self.session, message['url'], self.template)
+        except requests.RequestException:
+            page = None
+        message['timings']['http'] = time.perf_counter() - start
+        if page is not None:
+            message['source'] = 'http'
+        return page
+
+    def learn(self, page, url):
+        """Aprende la plantilla del feed de lo que devolvió el navegador"""
+        if isinstance(page, dict) and page.get('feed_url'):
+            template = feed_url_template(page['feed_url'], match_id_from_url(url))
+            if template and template != self.template:
+                self.template = template
+                save_feed_url_template(template)
+        return page
+
+class ClaimingQueue:
+    """Cola de tareas (o de páginas para parsear) vista desde un worker: get()
+    además avisa al proceso principal de qué tarea se lleva (por una
+    SimpleQueue, que escribe en el momento), así run_match_queue sabe qué
+    partidos tenía un worker que muere"""
+
+    def __init__(self, tasks, claims, holder):
+        self.tasks = tasks
+        self.claims = claims
+        self.holder = holder
+
+    def get(self, block=True, timeout=None):
+        item = self.tasks.get(block, timeout)
+        if item is not None:
+            if len(item) == 2:
+                # (mensaje, página) de html_queue: se avisa solo de la tarea
+                message = item[0]
+                self.claims.put((self.holder, (message['job'], message['i'], message['url'],
+                                               message['attempt'], message['browser_only'])))
+            else:
+                self.claims.put((self.holder, item))
+        return item
+
+    def get_nowait(self):
+        return self.get(False)
+
+def _task_message(task, slot):
+    """Mensaje de resultado de una tarea (liga, indice, url, intento,
+    solo_navegador) del worker slot. Además del resultado lleva lo necesario
+    para las métricas (ver LeagueMetrics): worker, inicio, tiempos por fase y
+    bytes de la página."""
+    job_key, i, url, attempt, browser_only = task
+    return {'job': job_key, 'i': i, 'url': url, 'attempt': attempt, 'browser_only': browser_only,
+            'worker': slot, 'started_at': time.time(), 'timings': {}}
+
+def payload_size(page):
+    """Bytes de lo que se trajo de un partido (HTML, instantánea o feed)"""
+    if isinstance(page, str):
+        return len(page.encode('utf-8'))
+    return len(json.dumps(page, ensure_ascii=False).encode('utf-8'))
+
+def _deliver_message(message, page, result_queue, html_queue, options):
+    """Entrega un partido: el fallo o el resultado del parseo por result_queue,
+    o la página a los procesos de parseo por html_queue"""
+    if page is not None:
+        message['bytes'] = payload_size(page)
+    if page is None:
+        result_queue.put(message)
+    elif html_queue is None:
+        result_queue.put(_parse_message(message, page, options))
+    else:
+        # La cola está acotada: si los parsers no dan abasto, el
+        # navegador espera aquí en vez de acumular páginas en memoria
+        message['fetched_at'] = time.time()
+        html_queue.put((message, page))
+
+def match_worker(task_queue, result_queue, options=None, html_queue=None, slot=0):
+    """Worker de navegador: mantiene un único Chrome vivo y va sacando
+    partidos (liga, indice, url, intento, solo_navegador) de la cola compartida
+    hasta recibir None.
+
+    Cada resultado se devuelve por result_queue como un dict con 'status'
+    ('ok' o 'error'), 'job', 'i', 'url', 'attempt', 'timings' y 'players' o
+    'error' (con su clasificación en 'kind' y 'transient', ver MatchError).
+    Los reintentos (intento > 0) se cargan siempre con un Chrome recién abierto.
+    Con http_first se prueba antes por HTTP, salvo en los reintentos y en los
+    partidos marcados solo_navegador (lo que trajo HTTP no sirvió).
+    options son las opciones de extracción (ver EXTRACTION_DEFAULTS); con
+    archive_raw el HTML de cada partido se guarda en el archivo raw y su
+    sha256 va en 'raw'. Con extract='js' no se pide el HTML sino la
+    instantánea de MATCH_SNAPSHOT_JS, y con extract='feed' el feed de Opta
+    (en ambos casos no hay nada que archivar).
+
+    Si se indica html_queue el worker solo navega: entrega la página a los
+    procesos de parseo (parse_worker) y pasa enseguida al siguiente partido.
+    slot es el número del worker (con disk_cache, su caché es cache/chrome/worker<slot>).
+
+    El driver se reinicia cada recycle_pages partidos o cuando su memoria pasa
+    de max_rss_mb, y siempre que Chrome se cae; el mensaje del partido tras el
+    que se reinicia lleva 'recycled' con el motivo ('pages', 'rss' o 'driver').
+    """
     # Activar modo silencioso para extract_match_data
     extract_match_data.quiet_mode = True
-    
+    options = extraction_options(options)
+    set_readiness(options['readiness'])
+    set_profiling(options['profile'])
+    load_page = {'js': load_match_snapshot, 'feed': load_match_feed}.get(options['extract'], load_match_page)
+
+    cache_dir = chrome_cache_dir(f"worker{slot}") if options['disk_cache'] else None
+
+    def new_driver():
+        return setup_driver(capture_network=options['extract'] == 'feed',
+                            blocking=options['blocking'], cache_dir=cache_dir)
+
+    def quit_driver():
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Chrome ya caído
+
+    # Con http_first Chrome solo se arranca cuando algún partido lo necesita
+    http = HttpFetcher(options['feed_url']) if options['http_first'] else None
+    driver = None
+    if not http:
+        try:
+            driver = new_driver()
+        except Exception:
+            pass  # se vuelve a intentar (y se informa del fallo) con el primer partido
+    pages = 0
     try:
-        for i, url in urls_with_indices:
+        while True:
+            task = task_queue.get()
+            if task is None:
+                break
+            job_key, i, url, attempt, browser_only = task
+            message = _task_message(task, slot)
+            page = http.fetch(message) if http and not attempt and not browser_only else None
+            if page is not None:
+                message['phases'] = take_phases()
+                _deliver_message(message, page, result_queue, html_queue, options)
+                continue
+
+            if driver is not None and attempt and pages:
+                quit_driver()
+                driver = None
+            message['source'] = 'browser'
+            if driver is None:
+                try:
+                    driver = new_driver()
+                    pages = 0
+                except Exception as e:
+                    # Sin Chrome este partido falla (transitorio), pero el worker sigue vivo
+                    _fail_message(message, DriverCrash(f"No se pudo arrancar Chrome: {type(e).__name__}: {e}"))
+                    _deliver_message(message, None, result_queue, html_queue, options)
+                    continue
+            start = time.perf_counter()
+            take_waits()
             try:
-                result = extract_match_data(driver, url, i)
-                if result and 'players' in result:
-                    batch_results.extend(result['players'])
-                    # Actualizar contador compartido
-                    if progress_counter is not None and progress_lock is not None:
-                        with progress_lock:
-                            progress_counter.value += 1
-                else:
-                    failed_matches.append((i, url, "No se extrajeron datos"))
-                    if progress_counter is not None and progress_lock is not None:
-                        with progress_lock:
-                            progress_counter.value += 1
+                page = load_page(driver, url)
             except Exception as e:
-                error_msg = f"{type(e).__name__}: {str(e)}"
-                failed_matches.append((i, url, error_msg))
-                # Registrar en archivo
-                ensure_parent_dir(ERROR_LOG_FILE)
-                with open(ERROR_LOG_FILE, 'a') as f:
-                    f.write(f"Partido {i}: {url}\n")
-                    f.write(f"Error: {error_msg}\n\n")
-                if progress_counter is not None and progress_lock is not None:
-                    with progress_lock:
-                        progress_counter.value += 1
+                _fail_message(message, e)
+            message['timings']['fetch'] = time.perf_counter() - start
+            for phase, (seconds, _) in take_waits().items():
+                message['timings'][phase] = seconds
+            message['phases'] = take_phases()
+            if http:
+                page = http.learn(page, url)
+
+            # Se decide antes de entregar el mensaje: una vez en la cola ya no se toca
+            pages += 1
+            if message.get('kind') == DriverCrash.kind:
+                recycle = 'driver'
+            else:
+                recycle = recycle_reason(driver, pages, options)
+            if recycle:
+                message['recycled'] = recycle
+
+            _deliver_message(message, page, result_queue, html_queue, options)
+            if recycle:
+                # El siguiente partido arranca un Chrome nuevo
+                quit_driver()
+                driver = None
+                pages = 0
+    finally:
+        if driver is not None:
+            quit_driver()
+
+def parse_worker(html_queue, result_queue, options=None):
+    """Worker de parseo: recibe (mensaje, página) de los navegadores hasta
+    recibir None y devuelve el resultado de cada partido por result_queue"""
+    extract_match_data.quiet_mode = True
+    options = extraction_options(options)
+    set_profiling(options['profile'])
+    while True:
+        item = html_queue.get()
+        if item is None:
+            break
+        message, page = item
+        message['timings']['queue'] = time.time() - message.pop('fetched_at')
+        result_queue.put(_parse_message(message, page, options))
+
+# ---------------------------------------------------------------------------
+# Varias pestañas por Chrome (--tabs)
+#
+# Un Chrome pasa casi toda su vida esperando a la red. Con tabs > 1 cada worker
+# abre varias pestañas en su navegador, lanza la carga de un partido en cada
+# una sin esperar a que termine (window.location) y las va recorriendo hasta
+# que alguna tiene el partido listo; entonces lee esa página (una cada vez) y
+# le da el siguiente partido. Así hay workers × tabs páginas cargando a la vez
+# con la memoria de solo workers Chromes.
+# ---------------------------------------------------------------------------
+
+# Estado de una pestaña: [url del documento, hay header, filas de jugadores, texto del header]
+TAB_STATE_JS = """var header = document.querySelector('.Opta-MatchHeader');
+return [location.href, !!header, document.getElementsByClassName('Opta-Player').length,
+        header ? header.innerText : ''];"""
+
+class TabLoad:
+    """Partido cargándose en una pestaña: las mismas esperas que
+    wait_for_match_widgets, pero comprobadas por sondeo (ver tab_worker)"""
+
+    def __init__(self, task, message):
+        self.task = task
+        self.message = message  # mensaje del partido para run_match_queue
+        self.match_id = match_id_from_url(task[2])
+        self.started = time.perf_counter()
+        self.header_at = None   # cuándo apareció el header
+        self.rows_at = None     # cuándo apareció la primera fila de jugadores
+        self.rows = None        # último número de filas...
+        self.changed_at = None  # ...y desde cuándo no cambia
+        self.error = None       # último error al consultar la pestaña
+
+    def ready(self, state, now):
+        """True cuando las filas de jugadores llevan READINESS_QUIET['rows']
+        sin cambiar (o se llega a READINESS['rows']). Lanza el MatchError
+        correspondiente si se agota la espera del header o de las tablas."""
+        if state is None:
+            # La pestaña no respondió (navegando): cuenta como sin header
+            loaded = has_header = False
+        else:
+            href, has_header, rows, header = state
+            # Hasta que la navegación no se confirma sigue el partido anterior
+            loaded = self.match_id in href
+        if not (loaded and has_header):
+            if now - self.started > HEADER_TIMEOUT:
+                if self.error is not None:
+                    raise classify_error(self.error)
+                raise HeaderTimeout("Timeout esperando el header del partido")
+            return False
+        if self.header_at is None:
+            self.header_at = now
+        if not rows:
+            if now - self.header_at > PLAYERS_TIMEOUT:
+                raise missing_tables_error(header)
+            return False
+        if self.rows_at is None:
+            self.rows_at = now
+        if rows != self.rows:
+            self.rows, self.changed_at = rows, now
+        return (now - self.changed_at >= READINESS_QUIET['rows']
+                or now - self.rows_at >= READINESS['rows'])
+
+def tab_worker(task_queue, result_queue, options=None, html_queue=None, slot=0):
+    """Worker de navegador con options['tabs'] pestañas en un único Chrome.
+
+    Recibe las mismas tareas y devuelve los mismos mensajes que match_worker,
+    pero tiene hasta tabs partidos cargándose a la vez: solo espera en la cola
+    de tareas cuando no tiene ninguna pestaña ocupada. La lectura de cada
+    página (page_source o MATCH_SNAPSHOT_JS) y su parseo se hacen de uno en
+    uno, en cuanto esa pestaña está lista. Para reiniciar Chrome (por páginas,
+    memoria, caída o un reintento) se deja de cargar partidos nuevos hasta
+    que terminan los de todas las pestañas.
+    """
+    extract_match_data.quiet_mode = True
+    options = extraction_options(options)
+    set_readiness(options['readiness'])
+    set_profiling(options['profile'])
+
+    def read_page(driver):
+        if options['extract'] == 'js':
+            return read_match_snapshot(driver)
+        with profile_phase('page_source'):
+            return driver.page_source
+    cache_dir = chrome_cache_dir(f"worker{slot}") if options['disk_cache'] else None
+
+    driver = None
+    handles = []
+    loads = {}          # pestaña -> TabLoad
+    pages = 0
+    restart = False     # no cargar más partidos hasta reiniciar Chrome
+    waiting = None      # reintento que espera a un Chrome nuevo
+    finished = False    # ya llegó el None de la cola
+
+    def open_browser():
+        nonlocal driver, handles, pages
+        driver = setup_driver(blocking=options['blocking'], cache_dir=cache_dir)
+        for _ in range(options['tabs'] - 1):
+            driver.switch_to.new_window('tab')
+        handles = list(driver.window_handles)
+        pages = 0
+
+    def quit_browser():
+        try:
+            driver.quit()
+        except Exception:
+            pass  # Chrome ya caído
+
+    def finish(handle, page=None, error=None):
+        nonlocal pages, restart
+        load = loads.pop(handle)
+        message = load.message
+        now = time.perf_counter()
+        message['timings']['fetch'] = now - load.started
+        if load.rows_at is not None:
+            message['timings']['rows'] = now - load.rows_at
+        if error is not None:
+            _fail_message(message, error)
+        # Solo se mide la lectura de esta pestaña: las esperas van por sondeo
+        message['phases'] = take_phases()
+
+        pages += 1
+        if restart:
+            recycle = None  # ya se va a reiniciar
+        elif message.get('kind') == DriverCrash.kind:
+            recycle = 'driver'
+        else:
+            recycle = recycle_reason(driver, pages, options)
+        if recycle:
+            message['recycled'] = recycle
+            restart = True
+        _deliver_message(message, page, result_queue, html_queue, options)
+
+    def next_task():
+        # Sin pestañas ocupadas no hay nada más que hacer: se espera a la cola
+        if not loads:
+            return task_queue.get()
+        try:
+            return task_queue.get_nowait()
+        except queue.Empty:
+            return False
+
+    # Chrome se arranca con el primer partido que lo necesita (con http_first
+    # puede que ninguno)
+    http = HttpFetcher(options['feed_url']) if options['http_first'] else None
+    try:
+        while True:
+            if restart and not loads:
+                # El siguiente partido que lo necesite arranca un Chrome nuevo
+                quit_browser()
+                driver = None
+                pages = 0
+                restart = False
+
+            # Un partido nuevo en cada pestaña libre
+            while not restart and len(loads) < options['tabs'] and (waiting or not finished):
+                if waiting:
+                    task, message = waiting
+                    waiting = None
+                else:
+                    task = next_task()
+                    if task is False:
+                        break
+                    if task is None:
+                        finished = True
+                        break
+                    job_key, i, url, attempt, browser_only = task
+                    message = _task_message(task, slot)
+                    page = http.fetch(message) if http and not attempt and not browser_only else None
+                    if page is not None:
+                        message['phases'] = take_phases()
+                        _deliver_message(message, page, result_queue, html_queue, options)
+                        continue
+                    if attempt and pages:
+                        # Los reintentos van con un Chrome recién abierto
+                        waiting = (task, message)
+                        restart = True
+                        break
+                message['source'] = 'browser'
+                if driver is None:
+                    try:
+                        open_browser()
+                    except Exception as e:
+                        # Sin Chrome este partido falla (transitorio), pero el worker sigue vivo
+                        quit_browser()
+                        driver = None
+                        _fail_message(message, DriverCrash(f"No se pudo arrancar Chrome: {type(e).__name__}: {e}"))
+                        _deliver_message(message, None, result_queue, html_queue, options)
+                        continue
+                handle = next(h for h in handles if h not in loads)
+                loads[handle] = TabLoad(task, message)
+                try:
+                    driver.switch_to.window(handle)
+                    driver.execute_script("window.location.href = arguments[0];", task[2])
+                except Exception as e:
+                    loads[handle].error = e
+
+            if not loads:
+                if finished and waiting is None:
+                    break
                 continue
+
+            # Recorrer las pestañas ocupadas y leer las que estén listas
+            progressed = False
+            for handle, load in list(loads.items()):
+                state = None
+                try:
+                    driver.switch_to.window(handle)
+                    state = driver.execute_script(TAB_STATE_JS)
+                except Exception as e:
+                    load.error = e
+                try:
+                    if not load.ready(state, time.perf_counter()):
+                        continue
+                    page = read_page(driver)
+                except Exception as e:
+                    error = classify_error(e)
+                    finish(handle, error=error)
+                    if error.kind == DriverCrash.kind:
+                        # Chrome caído: el resto de pestañas no va a terminar
+                        for other in list(loads):
+                            finish(other, error=DriverCrash(str(error)))
+                        break
+                else:
+                    finish(handle, page=page)
+                progressed = True
+            if not progressed:
+                time.sleep(READINESS_POLL)
     finally:
-        driver.quit()
-        
-    return batch_results, failed_matches
+        if driver is not None:
+            quit_browser()
+
+# ---------------------------------------------------------------------------
+# Backend Playwright (--backend playwright)
+#
+# Alternativa a Selenium: cada worker es un único Chromium controlado con la
+# API asíncrona de Playwright, con tabs páginas (cada una en su contexto)
+# cargando partidos a la vez desde un bucle asyncio. No hay sondeos desde
+# Python: las esperas son eventos de Playwright (wait_for_selector para el
+# header y las tablas, expect_response para el feed). Las páginas pasan por el
+# mismo parse_match_payload, así que las filas son las de extract_match_data.
+# ---------------------------------------------------------------------------
+
+# Filas de jugadores estables durante quiet ms (lo mismo que wait_until_stable con ROWS_STATE_JS)
+PW_ROWS_STABLE_JS = """quiet => {
+    const rows = document.getElementsByClassName('Opta-Player').length;
+    const now = performance.now();
+    if (window.__optaRows !== rows) {
+        window.__optaRows = rows;
+        window.__optaRowsAt = now;
+    }
+    return now - window.__optaRowsAt >= quiet;
+}"""
+
+# MATCH_SNAPSHOT_JS lee sus parámetros de arguments, como en execute_script
+PW_SNAPSHOT_JS = f"args => (function () {{ {MATCH_SNAPSHOT_JS} }}).apply(null, args)"
+
+async def pw_wait_for_match_widgets(page):
+    """wait_for_match_widgets para una página de Playwright. Devuelve los
+    segundos esperados a que se estabilicen las filas."""
+    try:
+        await page.wait_for_selector('.Opta-MatchHeader', state='attached', timeout=HEADER_TIMEOUT * 1000)
+    except PlaywrightTimeout:
+        raise HeaderTimeout("Timeout esperando el header del partido")
+    try:
+        await page.wait_for_selector('.Opta-Player', state='attached', timeout=PLAYERS_TIMEOUT * 1000)
+    except PlaywrightTimeout:
+        raise missing_tables_error(await page.inner_text('.Opta-MatchHeader'))
+
+    start = time.perf_counter()
+    if READINESS['rows'] > 0:
+        try:
+            await page.wait_for_function(PW_ROWS_STABLE_JS, arg=READINESS_QUIET['rows'] * 1000,
+                                         polling=READINESS_POLL * 1000, timeout=READINESS['rows'] * 1000)
+        except PlaywrightTimeout:
+            pass  # se llegó al máximo: se lee lo que haya
+    return time.perf_counter() - start
+
+async def pw_load_match(page, url, extract):
+    """Abre un partido en una página de Playwright y devuelve (datos, segundos
+    esperando a las filas) con los mismos datos que load_match_page,
+    load_match_snapshot o load_match_feed según extract"""
+    if extract == 'feed':
+        try:
+            async with page.expect_response(lambda response: FEED_URL_PATTERN.search(response.url),
+                                            timeout=FEED_WAIT * 1000) as response_info:
+                await page.goto(url, wait_until='commit')
+            response = await response_info.value
+            feed = decode_feed(await response.text())
+            if feed and feed_has_players(feed, match_id_from_url(url)):
+                return {'feed': feed, 'feed_url': response.url}, None
+        except PlaywrightTimeout:
+            pass  # sin feed: se lee el widget como con --extract js
+        rows_wait = await pw_wait_for_match_widgets(page)
+        return await page.evaluate(PW_SNAPSHOT_JS, [DATE_PATTERNS, JORNADA_PATTERN]), rows_wait
+
+    await page.goto(url, wait_until='commit')
+    rows_wait = await pw_wait_for_match_widgets(page)
+    if extract == 'js':
+        return await page.evaluate(PW_SNAPSHOT_JS, [DATE_PATTERNS, JORNADA_PATTERN]), rows_wait
+    return await page.content(), rows_wait
+
+def classify_playwright_error(exc):
+    """classify_error para las excepciones de Playwright"""
+    if isinstance(exc, PlaywrightTimeout):
+        # Solo puede ser goto: la página ni siquiera empezó a cargar
+        return HeaderTimeout(f"Timeout abriendo la página: {str(exc).strip().splitlines()[0]}")
+    if isinstance(exc, PlaywrightError) and re.search(r'crash|closed|disconnected', str(exc), re.I):
+        return DriverCrash(f"{type(exc).__name__}: {str(exc).strip().splitlines()[0]}")
+    return classify_error(exc)
+
+def playwright_worker(task_queue, result_queue, options=None, html_queue=None, slot=0):
+    """Worker de navegador con Playwright: mismas tareas y mensajes que
+    match_worker, con options['tabs'] partidos cargándose a la vez en un único
+    Chromium (ver _playwright_worker). Los contextos de Playwright no tienen
+    caché en disco: slot solo identifica al worker en las métricas."""
+    extract_match_data.quiet_mode = True
+    options = extraction_options(options)
+    set_readiness(options['readiness'])
+    # Las páginas se intercalan en el bucle: solo se perfila el parseo
+    set_profiling(options['profile'])
+    asyncio.run(_playwright_worker(task_queue, result_queue, options, html_queue, slot))
+
+async def _playwright_worker(task_queue, result_queue, options, html_queue, slot):
+    loop = asyncio.get_running_loop()
+    blocking = options['blocking'] or {}
+    blocked_types = set(blocking.get('types', []))
+    blocked_urls = blocked_url_regex(blocking)
+
+    async def block_requests(route):
+        request = route.request
+        if request.resource_type in blocked_types or (blocked_urls and blocked_urls.match(request.url)):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async with async_playwright() as playwright:
+        browser = None
+        launching = asyncio.Lock()
+
+        async def new_page():
+            nonlocal browser
+            # Si Chromium se ha caído, la primera página que lo note lo relanza
+            async with launching:
+                if browser is None or not browser.is_connected():
+                    browser = await playwright.chromium.launch(headless=True, args=CHROME_ARGS)
+            context = await browser.new_context(user_agent=USER_AGENT)
+            if blocked_types or blocked_urls:
+                await context.route('**/*', block_requests)
+            return await context.new_page()
+
+        async def close_page(page):
+            try:
+                await page.context.close()
+            except Exception:
+                pass  # Chromium ya caído
+
+        # Cada página libre deja su buzón en idle; el repartidor saca una tarea
+        # de la cola compartida por cada buzón, así este worker nunca se queda
+        # con más partidos de los que puede cargar
+        idle = asyncio.Queue()
+        inboxes = [asyncio.Queue() for _ in range(options['tabs'])]
+
+        async def dispatch():
+            while True:
+                inbox = await idle.get()
+                task = await loop.run_in_executor(None, task_queue.get)
+                if task is None:
+                    break
+                inbox.put_nowait(task)
+            # El None de run_match_queue cierra todas las páginas de este worker
+            for inbox in inboxes:
+                inbox.put_nowait(None)
+
+        async def run_page(inbox):
+            # La página se abre con el primer partido que la necesita
+            page = None
+            pages = 0
+            # requests no es asíncrono: cada página con su sesión, en un hilo
+            http = HttpFetcher(options['feed_url']) if options['http_first'] else None
+            try:
+                while True:
+                    idle.put_nowait(inbox)
+                    task = await inbox.get()
+                    if task is None:
+                        break
+                    job_key, i, url, attempt, browser_only = task
+                    message = _task_message(task, slot)
+                    if http and not attempt and not browser_only:
+                        payload = await loop.run_in_executor(None, http.fetch, message)
+                        if payload is not None:
+                            _deliver_message(message, payload, result_queue, html_queue, options)
+                            continue
+                    if page is not None and attempt and pages:
+                        # Los reintentos van con un contexto recién creado
+                        await close_page(page)
+                        page = None
+                    message['source'] = 'browser'
+                    if page is None:
+                        try:
+                            page = await new_page()
+                            pages = 0
+                        except Exception as e:
+                            # Sin Chromium este partido falla (transitorio), pero el worker sigue vivo
+                            _fail_message(message, DriverCrash(f"No se pudo arrancar Chromium: "
+                                                               f"{type(e).__name__}: {e}"))
+                            _deliver_message(message, None, result_queue, html_queue, options)
+                            continue
+                    start = time.perf_counter()
+                    payload = None
+                    try:
+                        payload, rows_wait = await pw_load_match(page, url, options['extract'])
+                        if rows_wait is not None:
+                            message['timings']['rows'] = rows_wait
+                    except Exception as e:
+                        _fail_message(message, classify_playwright_error(e))
+                    message['timings']['fetch'] = time.perf_counter() - start
+                    if http:
+                        payload = http.learn(payload, url)
+
+                    pages += 1
+                    if message.get('kind') == DriverCrash.kind:
+                        recycle = 'driver'
+                    elif options['recycle_pages'] and pages >= options['recycle_pages']:
+                        recycle = 'pages'
+                    else:
+                        recycle = None
+                    if recycle:
+                        message['recycled'] = recycle
+                    # El parseo (si lo hace este worker) bloquea el bucle: una página cada vez
+                    _deliver_message(message, payload, result_queue, html_queue, options)
+                    if recycle:
+                        await close_page(page)
+                        page = None
+                        pages = 0
+            finally:
+                if page is not None:
+                    await close_page(page)
+
+        await asyncio.gather(dispatch(), *(run_page(inbox) for inbox in inboxes))
+        if browser is not None and browser.is_connected():
+            await browser.close()
+
+# ---------------------------------------------------------------------------
+# Concurrencia adaptativa (--adaptive)
+#
+# Se empieza con pocos workers y cada cierto tiempo se mira cómo va la ventana
+# de partidos recién terminados (latencia de carga, timeouts, ritmo) y la
+# máquina (carga por CPU, memoria disponible) para añadir o retirar un worker.
+# Crecer es arrancar otro proceso; retirar, meter un None en la cola (el
+# primer worker que lo saque termina), posible porque la cola se rellena poco
+# a poco y no hay partidos asignados de antemano.
+# ---------------------------------------------------------------------------
+
+ADAPTIVE_DEFAULTS = {
+    'start': 2,                    # workers al empezar
+    'interval': 20,                # segundos mínimos entre decisiones
+    'grow_timeout_rate': 0.10,     # con más timeouts que esto no se crece...
+    'shrink_timeout_rate': 0.25,   # ...y con más que esto se retira un worker
+    'grow_load': 0.85,             # carga (loadavg de 1 min) por CPU máxima para crecer
+    'shrink_load': 1.5,
+    'worker_mb': 700,              # memoria estimada de un worker (chromedriver + Chrome)
+    'reserve_mb': 1024,            # memoria disponible que siempre se deja libre
+    'latency_factor': 2.0,         # p50 de carga respecto al mejor visto que se considera degradado
+    'min_gain': 0.05,              # mejora de ritmo mínima para conservar un worker añadido
+}
+
+def available_memory_mb():
+    """Memoria disponible (MB) según psutil o /proc/meminfo, o None"""
+    if psutil is not None:
+        return psutil.virtual_memory().available / 2**20
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+def load_per_cpu():
+    """Carga media del último minuto por CPU, o None si el sistema no la da"""
+    try:
+        return os.getloadavg()[0] / (os.cpu_count() or 1)
+    except (AttributeError, OSError):
+        return None
+
+class ConcurrencyController:
+    """Decide cuántos workers de navegador mantener activos (ver ADAPTIVE_DEFAULTS)"""
+
+    def __init__(self, max_workers, settings=None):
+        self.settings = {**ADAPTIVE_DEFAULTS, **(settings or {})}
+        self.max_workers = max_workers
+        self.best_latency = None
+        self.last_grow_rate = None     # ritmo antes del último worker añadido
+        self.decisions = []
+        self._reset_window()
+
+    def _reset_window(self):
+        self.window_start = time.perf_counter()
+        self.latencies = []
+        self.timeouts = 0
+        self.results = 0
+
+    def record(self, message):
+        """Apunta el resultado de un partido en la ventana actual"""
+        self.results += 1
+        if message['status'] == 'ok':
+            self.latencies.append(message['timings'].get('fetch', 0))
+        elif message.get('kind') in (HeaderTimeout.kind, NoPlayerTables.kind):
+            self.timeouts += 1
+
+    def decide(self, active):
+        """Devuelve (+1, -1 o 0, motivo) para la ventana actual, o (0, None) si
+        aún no toca decidir"""
+        s = self.settings
+        elapsed = time.perf_counter() - self.window_start
+        if elapsed < s['interval'] or self.results < active:
+            return 0, None
+
+        rate = self.results / elapsed * 60
+        timeout_rate = self.timeouts / self.results
+        latency = sorted(self.latencies)[len(self.latencies) // 2] if self.latencies else None
+        if latency is not None and (self.best_latency is None or latency < self.best_latency):
+            self.best_latency = latency
+        load = load_per_cpu()
+        memory = available_memory_mb()
+        self._reset_window()
+
+        metrics = [f"{rate:.1f} partidos/min", f"timeouts {timeout_rate:.0%}"]
+        if latency is not None:
+            metrics.append(f"p50 {latency:.1f}s")
+        if load is not None:
+            metrics.append(f"carga/CPU {load:.2f}")
+        if memory is not None:
+            metrics.append(f"memoria libre {memory:.0f} MB")
+        metrics = ', '.join(metrics)
+
+        slow = latency is not None and latency > s['latency_factor'] * self.best_latency
+        shrink = None
+        if timeout_rate > s['shrink_timeout_rate']:
+            shrink = "demasiados timeouts"
+        elif load is not None and load > s['shrink_load']:
+            shrink = "CPU saturada"
+        elif memory is not None and memory < s['reserve_mb']:
+            shrink = "poca memoria"
+        elif slow:
+            shrink = "páginas mucho más lentas"
+        elif self.last_grow_rate is not None and rate < self.last_grow_rate * (1 + s['min_gain']):
+            # El último worker añadido no mejoró el ritmo: se quita y no se vuelve a pasar de ahí
+            shrink = "el último worker no mejoró el ritmo"
+            self.max_workers = active - 1
+        self.last_grow_rate = None
+
+        if shrink and active > 1:
+            decision = (-1, f"{shrink} ({metrics})")
+        elif not shrink and active < self.max_workers \
+                and timeout_rate <= s['grow_timeout_rate'] \
+                and (load is None or load < s['grow_load']) \
+                and (memory is None or memory > s['reserve_mb'] + s['worker_mb']):
+            self.last_grow_rate = rate
+            decision = (1, metrics)
+        else:
+            return 0, None
+        self.decisions.append(decision)
+        return decision
+
+def run_match_queue(jobs, workers, on_job_done=None, parsers=0, options=None, adaptive=False):
+    """Procesa los partidos de uno o varios trabajos de liga (ver
+    prepare_league_job) con un único pool de workers y una cola compartida.
+
+    Cada worker pide el siguiente partido en cuanto termina el anterior, así un
+    worker atascado en timeouts no deja a los demás parados con su lote ya
+    terminado: la ejecución acaba cuando acaba el último partido. Los partidos
+    de varias ligas comparten el mismo pool (un solo arranque de Chrome por
+    worker); los terminados se apuntan en el journal de su liga según llegan y
+    on_job_done(job, fallidos) se llama en cuanto se completa cada liga.
+
+    options son las opciones de extracción de los workers (ver
+    EXTRACTION_DEFAULTS). Con archive_raw el HTML de cada partido se guarda en
+    el archivo raw y se apunta en el índice de su liga (ver reparse_league).
+
+    Con parsers > 0 la extracción va en dos etapas: los workers de navegador
+    solo cargan páginas y las pasan por una cola acotada a ese número de
+    procesos de parseo, así Chrome no espera a BeautifulSoup para cargar el
+    siguiente partido. Con parsers=0 cada worker parsea sus propias páginas.
+
+    Con adaptive=True workers es el máximo: se empieza con pocos y un
+    ConcurrencyController decide sobre la marcha cuántos mantener activos.
+
+    Los fallos transitorios (ver MatchError) vuelven a la cola al final, tras
+    una espera que se duplica en cada intento, hasta options['retries'] veces.
+    Los workers (también los de parseo) avisan de cada tarea que sacan de su
+    cola (ClaimingQueue): si uno muere, sus partidos cuentan como fallo
+    transitorio (WorkerDied) y se arranca otro en su hueco mientras quede
+    trabajo.
+    Devuelve {liga: [(indice, url, error, tipo, intentos)]} con los partidos
+    que siguen fallando.
+    """
+    options = extraction_options(options)
+    set_profiling(options['profile'])
+    jobs_by_key = {job['config']['key']: job for job in jobs}
+    tasks = [(key, i, url, 0, False) for key, job in jobs_by_key.items() for i, url in job['tasks']]
+    remaining = {key: len(job['tasks']) for key, job in jobs_by_key.items()}
+    failed = {key: [] for key in jobs_by_key}
+    metrics = {key: LeagueMetrics() for key in jobs_by_key}
+    total_urls = len(tasks)
+
+    def job_done(key):
+        metrics_file = jobs_by_key[key]['config'].get('metrics_file')
+        if metrics_file and metrics[key].attempts:
+            save_league_metrics(metrics_file, metrics[key].summary(failed[key]))
+        if on_job_done:
+            with tqdm.external_write_mode():
+                on_job_done(jobs_by_key[key], failed[key])
+
+    # Ligas sin partidos pendientes (p.ej. todo recuperado con --resume)
+    for key, count in remaining.items():
+        if count == 0:
+            job_done(key)
+    if total_urls == 0:
+        return failed
+
+    # Configuración de paralelismo
+    if workers:
+        max_workers = workers
+    elif adaptive:
+        # En modo adaptativo el máximo solo es un techo: lo decide el controlador
+        max_workers = max(8, os.cpu_count() or 1)
+    else:
+        # Usamos hasta 8 workers si es posible
+        max_workers = min(8, total_urls)
+    max_workers = max(1, min(max_workers, total_urls))
+    controller = ConcurrencyController(max_workers) if adaptive else None
+    active = min(controller.settings['start'], max_workers) if adaptive else max_workers
+    peak_active = active
+
+    tabs = options['tabs']
+    if options['backend'] == 'playwright':
+        worker_target = playwright_worker
+        tabs_label = f" Playwright de {tabs} páginas"
+    else:
+        worker_target = tab_worker if tabs > 1 else match_worker
+        tabs_label = f" de {tabs} pestañas" if tabs > 1 else ""
+
+    if adaptive:
+        print(f"Modo adaptativo: {active} workers{tabs_label} al empezar (máximo {max_workers}) "
+              f"para procesar {total_urls} partidos...\n")
+    elif parsers:
+        print(f"Iniciando {max_workers} workers de navegador{tabs_label} y {parsers} de parseo "
+              f"para procesar {total_urls} partidos...\n")
+    else:
+        print(f"Iniciando {max_workers} workers{tabs_label} para procesar {total_urls} partidos...\n")
+
+    task_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+    # Qué tarea saca cada worker de la cola (ver ClaimingQueue)
+    claim_queue = multiprocessing.SimpleQueue()
+    html_queue = multiprocessing.Queue(maxsize=2 * parsers) if parsers else None
+    processes = []
+    holders = {}        # tarea -> hueco del worker (o 'parser<n>') que la tiene
+    abandoned = set()   # tareas de workers caídos que ya se dieron por fallidas
+    respawned = 0
+
+    def start_worker():
+        # Cada worker usa el primer hueco libre (su caché de Chrome va por hueco);
+        # el de un worker muerto se libera al recoger sus partidos (reap_workers)
+        used = {slot for slot, _ in processes}
+        slot = next(slot for slot in range(len(processes) + 1) if slot not in used)
+        process = multiprocessing.Process(target=worker_target,
+                                          args=(ClaimingQueue(task_queue, claim_queue, slot), result_queue,
+                                                options, html_queue, slot),
+                                          daemon=True)
+        process.start()
+        processes.append((slot, process))
+
+    parser_processes = []
+
+    def start_parser(name):
+        process = multiprocessing.Process(target=parse_worker,
+                                          args=(ClaimingQueue(html_queue, claim_queue, name), result_queue,
+                                                options),
+                                          daemon=True)
+        process.start()
+        parser_processes.append((name, process))
+
+    for _ in range(active):
+        start_worker()
+    for n in range(parsers):
+        start_parser(f"parser{n}")
+
+    # La cola se rellena poco a poco (como mucho una tarea por pestaña de cada
+    # worker más una en espera)
+    # para que nada quede asignado de antemano a un worker concreto
+    pending = list(reversed(tasks))
+    retries = []    # montículo (cuándo, orden, tarea) de los reintentos en espera
+    in_flight = 0
+    received = 0
+    done = 0
+    started = time.perf_counter()
+    stage_times = {}
+    recycled = {}
+    sources = {}    # origen ('http'/'browser') -> [partidos, segundos]
+    retried = recovered = 0
+
+    def feed():
+        nonlocal in_flight, active
+        # Los reintentos cuya espera ha terminado van detrás de todo lo pendiente
+        while retries and retries[0][0] <= time.perf_counter():
+            pending.insert(0, heapq.heappop(retries)[2])
+        while pending and in_flight < (tabs + 1) * active:
+            task_queue.put(pending.pop())
+            in_flight += 1
+        # Solo se cierra cuando ya no puede aparecer ningún reintento más
+        if not pending and not retries and in_flight == 0:
+            for _ in range(active):
+                task_queue.put(None)
+            active = 0
+
+    def read_claims():
+        while not claim_queue.empty():
+            holder, task = claim_queue.get()
+            if task not in abandoned:
+                holders[task] = holder
+
+    def handle(message):
+        """Apunta el resultado de un partido: journal, reintento o fallo definitivo"""
+        nonlocal received, in_flight, done, active, peak_active, retried, recovered
+        key, i, url = message['job'], message['i'], message['url']
+        attempt = message.get('attempt', 0)
+        task = (key, i, url, attempt, message.get('browser_only', False))
+        if task in abandoned:
+            # Resultado tardío de un partido que ya se dio por perdido con su worker
+            abandoned.discard(task)
+            return
+        holders.pop(task, None)
+        received += 1
+        in_flight -= 1
+        for stage, seconds in message.get('timings', {}).items():
+            stage_times.setdefault(stage, []).append(seconds)
+        if message.get('recycled'):
+            recycled[message['recycled']] = recycled.get(message['recycled'], 0) + 1
+        metrics[key].record(message)
+        if options['profile']:
+            write_profile(profile_record(message, jobs_by_key[key]['config']))
+        if message.get('source') and message['status'] == 'ok':
+            source = sources.setdefault(message['source'], [0, 0.0])
+            source[0] += 1
+            source[1] += match_latency(message)
+        job = jobs_by_key[key]
+        if message.get('raw'):
+            append_jsonl(job['config']['raw_index_file'],
+                         {'id': match_id_from_url(url), 'aux': i, 'url': url,
+                          'sha256': message['raw']})
+        if message['status'] == 'ok':
+            append_jsonl(job['journal_file'],
+                         {'id': match_id_from_url(url), 'aux': i, 'url': url,
+                          'source': message.get('source'), 'seconds': round(match_latency(message), 3),
+                          'players': message['players']})
+            if job.get('writer'):
+                job['writer'].add_match(i, message['players'])
+            recovered += 1 if attempt else 0
+        elif message.get('source') == 'http' and not attempt:
+            # Lo que trajo la petición HTTP no sirvió: enseguida otra vez, ya con el
+            # navegador. No gasta intento: no reinicia Chrome ni cuenta como reintento
+            pending.append((key, i, url, attempt, True))
+            feed()
+            return
+        elif message.get('transient', True) and attempt < options['retries']:
+            # Transitorio: otra vez a la cola (con Chrome nuevo) tras la espera
+            delay = options['retry_backoff'] * 2 ** attempt
+            heapq.heappush(retries, (time.perf_counter() + delay, received, (key, i, url, attempt + 1, task[4])))
+            retried += 1
+            feed()
+            return
+        else:
+            failed[key].append((i, url, message['error'], message.get('kind', MatchError.kind),
+                                attempt + 1))
+        done += 1
+        pbar.update(1)
+        remaining[key] -= 1
+        if remaining[key] == 0:
+            job_done(key)
+        if controller and pending:
+            controller.record(message)
+            change, reason = controller.decide(active)
+            if change > 0:
+                pbar.write(f"📈 Workers {active} → {active + 1}: {reason}")
+                start_worker()
+                active += 1
+                peak_active = max(peak_active, active)
+            elif change < 0:
+                pbar.write(f"📉 Workers {active} → {active - 1}: {reason}")
+                task_queue.put(None)
+                active -= 1
+        feed()
+
+    def give_up(holder, exitcode):
+        """Da por fallidos (transitorios) los partidos que tenía un worker muerto"""
+        for task in [task for task, held_by in holders.items() if held_by == holder]:
+            message = _task_message(task, holder)
+            _fail_message(message, WorkerDied(f"El worker {holder} terminó con código {exitcode}"))
+            handle(message)
+            abandoned.add(task)
+
+    def reap_workers():
+        """Da por fallidos (transitorios) los partidos de los workers que han
+        muerto y los sustituye mientras quede trabajo. Los de parseo se
+        sustituyen siempre: sin ellos los navegadores se quedan esperando
+        en html_queue. Devuelve False si no queda ningún parser."""
+        nonlocal active, respawned
+        read_claims()
+        for name, process in list(parser_processes):
+            if process.is_alive():
+                continue
+            parser_processes.remove((name, process))
+            pbar.write(f"💥 El worker de parseo {name} terminó inesperadamente (código {process.exitcode})")
+            if respawned < max_workers + parsers:
+                start_parser(name)
+                respawned += 1
+            give_up(name, process.exitcode)
+        for slot, process in list(processes):
+            if process.is_alive():
+                continue
+            lost = [task for task, holder in holders.items() if holder == slot]
+            processes.remove((slot, process))
+            if not lost and process.exitcode == 0:
+                continue  # retirado con su None
+            pbar.write(f"💥 El worker {slot} terminó inesperadamente (código {process.exitcode}) "
+                       f"con {len(lost)} partidos")
+            if active and respawned < max_workers + parsers and (pending or retries or lost):
+                start_worker()
+                respawned += 1
+            elif active:
+                active -= 1
+            give_up(slot, process.exitcode)
+        return not parsers or bool(parser_processes)
+
+    feed()
+    try:
+        with tqdm(total=total_urls, desc="Extrayendo partidos", unit="partido",
+                  bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as pbar:
+            while done < total_urls:
+                try:
+                    message = result_queue.get(timeout=1)
+                except queue.Empty:
+                    # Si todos los workers (o todos los de parseo) han muerto no va a llegar nada más
+                    if not reap_workers() or not any(p.is_alive() for _, p in processes):
+                        print(f"\n❌ Los workers terminaron con {total_urls - done} partidos sin procesar")
+                        break
+                    feed()
+                    continue
+                # La tarea se reclamó antes de que saliera su resultado
+                read_claims()
+                handle(message)
+    finally:
+        for _ in parser_processes:
+            try:
+                html_queue.put(None, timeout=1)
+            except queue.Full:
+                break  # parsers parados (p.ej. tras Ctrl-C): se terminan abajo
+        for process in [p for _, p in processes] + [p for _, p in parser_processes]:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+    print_stage_times(stage_times, received, time.perf_counter() - started)
+    print_sources(sources)
+    if controller and controller.decisions:
+        grown = sum(1 for change, _ in controller.decisions if change > 0)
+        print(f"🎛️ Modo adaptativo: {grown} workers añadidos y {len(controller.decisions) - grown} "
+              f"retirados; hasta {peak_active} activos a la vez")
+    if recycled:
+        print(f"♻️ Chrome reiniciado {sum(recycled.values())} veces "
+              f"({recycled.get('pages', 0)} por número de páginas, {recycled.get('rss', 0)} por memoria, "
+              f"{recycled.get('driver', 0)} por caídas)")
+    if retried:
+        print(f"🔁 {retried} reintentos, {recovered} partidos recuperados")
+    print_failed_matches(failed)
+
+    # Ligas que se quedaron a medias (workers caídos): no se cierran. Su BBDD
+    # sigue como estaba y el journal se conserva para reanudarlas
+    unfinished = [key for key, count in remaining.items() if count > 0]
+    if unfinished:
+        print("\n⏸️ Ligas sin terminar. Los partidos terminados están en los journals:")
+        for key in unfinished:
+            job = jobs_by_key[key]
+            metrics_file = job['config'].get('metrics_file')
+            if metrics_file and metrics[key].attempts:
+                save_league_metrics(metrics_file, metrics[key].summary(failed[key]))
+            if job.get('writer'):
+                job['writer'].discard()
+            print(f"   {job['journal_file']} ({remaining[key]} partidos sin procesar)")
+        print("   Reanuda con --resume")
+
+    return failed
+
+# ---------------------------------------------------------------------------
+# Métricas por liga
+#
+# Los mensajes de resultado ya traen todo lo necesario (tiempos por fase,
+# bytes, worker y clasificación del error), así que no hace falta otro canal
+# entre procesos: run_match_queue los acumula por liga y al completarse cada
+# una escribe data/opta/metrics/metrics_<liga>_<temporada>.json.
+# ---------------------------------------------------------------------------
+
+def percentile(values, q):
+    """Percentil q (0-100) por rango más cercano, o None sin valores"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+def distribution(values):
+    return {'count': len(values), 'mean': round(sum(values) / len(values), 3),
+            'p50': round(percentile(values, 50), 3), 'p95': round(percentile(values, 95), 3),
+            'max': round(max(values), 3)}
+
+class LeagueMetrics:
+    """Métricas de una liga a partir de los mensajes de sus partidos (todos
+    los intentos, también los que se reintentan)"""
+
+    def __init__(self):
+        self.started = time.time()
+        self.attempts = 0
+        self.ok = 0
+        self.timings = {}   # fase -> [segundos]
+        self.bytes = []
+        self.errors = {}    # tipo de error -> intentos fallidos
+        self.sources = {}   # origen -> partidos
+        self.workers = {}   # worker -> intentos
+
+    def record(self, message):
+        self.attempts += 1
+        for stage, seconds in message.get('timings', {}).items():
+            self.timings.setdefault(stage, []).append(seconds)
+        if 'bytes' in message:
+            self.bytes.append(message['bytes'])
+        if message.get('worker') is not None:
+            worker = str(message['worker'])
+            self.workers[worker] = self.workers.get(worker, 0) + 1
+        if message['status'] == 'ok':
+            self.ok += 1
+            if message.get('source'):
+                self.sources[message['source']] = self.sources.get(message['source'], 0) + 1
+        else:
+            kind = message.get('kind', MatchError.kind)
+            self.errors[kind] = self.errors.get(kind, 0) + 1
+
+    def summary(self, failed):
+        """Dict de métricas; failed son los partidos que siguen fallando
+        [(indice, url, error, tipo, intentos)]"""
+        elapsed = time.time() - self.started
+        failed_by_kind = {}
+        for item in failed:
+            failed_by_kind[item[3]] = failed_by_kind.get(item[3], 0) + 1
+        return {
+            'generated': datetime.now().isoformat(timespec='seconds'),
+            'elapsed_seconds': round(elapsed, 1),
+            'matches': self.ok + len(failed),
+            'ok': self.ok,
+            'failed': len(failed),
+            'attempts': self.attempts,
+            'matches_per_min': round(self.ok / elapsed * 60, 2) if elapsed else None,
+            'phases': {stage: distribution(times) for stage, times in self.timings.items() if times},
+            'bytes': {**distribution(self.bytes), 'total': sum(self.bytes)} if self.bytes else None,
+            'errors_by_kind': self.errors,
+            'failed_by_kind': failed_by_kind,
+            'sources': self.sources,
+            'attempts_by_worker': self.workers,
+        }
+
+def profile_record(message, league_config):
+    """Registro de perfilado (logs/profile.jsonl) del mensaje de un partido"""
+    phases = {stage: round(seconds, 4) for stage, seconds in message.get('timings', {}).items()
+              if stage != 'rows'}  # 'rows' es la misma espera que 'wait_rows'
+    phases.update(message.get('phases', {}))
+    return {'kind': 'match', 'league': league_config['key'], 'season': league_config.get('season'),
+            'worker': message.get('worker'), 'id': match_id_from_url(message['url']),
+            'attempt': message.get('attempt', 0), 'status': message['status'],
+            'error_kind': message.get('kind'), 'source': message.get('source'),
+            'bytes': message.get('bytes'), 'phases': phases}
+
+def save_league_metrics(metrics_file, summary):
+    ensure_parent_dir(metrics_file)
+    tmp_file = metrics_file + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=1, ensure_ascii=False)
+    os.replace(tmp_file, metrics_file)
+
+def print_failed_matches(failed):
+    """Tabla de los partidos que siguen fallando ({liga: [(indice, url, error, tipo, intentos)]})"""
+    rows = sorted((key, *item) for key, items in failed.items() for item in items)
+    if not rows:
+        return
+    print(f"\n❌ {len(rows)} partidos sin datos tras los reintentos:")
+    print(f"   {'liga':8} {'aux':>4}  {'ID_PARTIDO':26} {'tipo':15} {'intentos':>8}  error")
+    for key, i, url, error, kind, attempts in rows:
+        print(f"   {key:8} {i:>4}  {match_id_from_url(url) or '':26} {kind:15} {attempts:>8}  {error[:70]}")
+
+STAGE_LABELS = {'http': 'intento HTTP', 'fetch': 'navegador', 'rows': 'espera de filas', 'queue': 'cola de parseo', 'parse': 'parseo'}
+
+SOURCE_LABELS = {'http': 'HTTP directo', 'browser': 'navegador'}
+
+def match_latency(message):
+    """Segundos hasta tener los datos de un partido, contando el intento HTTP"""
+    timings = message.get('timings', {})
+    if message.get('source') == 'http':
+        return timings.get('http', 0.0)
+    return timings.get('http', 0.0) + timings.get('fetch', 0.0)
+
+def print_sources(sources):
+    """Cuántos partidos salieron por HTTP y cuántos con navegador ({origen: [partidos, segundos]})"""
+    total = sum(count for count, _ in sources.values())
+    if not total or set(sources) == {'browser'}:
+        return
+    parts = [f"{SOURCE_LABELS.get(source, source)} {count} ({count / total:.0%}, {seconds / count:.2f}s de media)"
+             for source, (count, seconds) in sorted(sources.items(), key=lambda item: -item[1][0])]
+    print(f"🌐 Origen de los partidos: {' | '.join(parts)}")
+
+def print_stage_times(stage_times, matches, elapsed):
+    """Muestra el tiempo medio por partido de cada etapa y el ritmo global"""
+    if not matches or not elapsed:
+        return
+    parts = [f"{STAGE_LABELS.get(stage, stage)} {sum(times) / len(times):.2f}s"
+             for stage, times in stage_times.items() if times]
+    print(f"\n⏱️ Media por partido: {' | '.join(parts)} — "
+          f"{matches / elapsed * 60:.1f} partidos/min ({matches} en {elapsed:.0f}s)")
+    rows = stage_times.get('rows')
+    if rows:
+        print(f"   Espera de filas: {format_waits({'rows': [sum(rows), len(rows)]})}")
+
+# Fases de logs/profile.jsonl en el orden en que ocurren
+PROFILE_LABELS = {
+    'urls_setup': 'arranque de Chrome (URLs)',
+    'urls_get': 'carga del calendario',
+    'urls_scroll': 'scroll del calendario',
+    'urls_links': 'lectura de enlaces',
+    'http': 'intento HTTP',
+    'get': 'driver.get',
+    'wait_header': 'espera Opta-MatchHeader',
+    'wait_players': 'espera Opta-Player',
+    'wait_rows': 'filas estables',
+    'page_source': 'page_source',
+    'snapshot': 'instantánea JS',
+    'fetch': 'navegador (total)',
+    'queue': 'cola de parseo',
+    'dom': 'construcción del DOM',
+    'teams': 'nombres de equipo',
+    'page_text': 'fecha y jornada',
+    'tables': 'tablas de jugadores',
+    'parse': 'parseo (total)',
+    'save_csv': 'escritura del CSV',
+}
+
+def load_profile(profile_file=PROFILE_FILE):
+    records = []
+    if not os.path.exists(profile_file):
+        return records
+    with open(profile_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue  # línea a medias
+    return records
+
+def print_phase_table(records, indent="   "):
+    """p50/p95/máximo/total de cada fase de unos registros de perfilado"""
+    phases = {}
+    for record in records:
+        for phase, seconds in record.get('phases', {}).items():
+            phases.setdefault(phase, []).append(seconds)
+    order = list(PROFILE_LABELS) + sorted(set(phases) - set(PROFILE_LABELS))
+    print(f"{indent}{'fase':28} {'n':>6} {'p50 (s)':>8} {'p95 (s)':>8} {'máx (s)':>8} {'total (s)':>10}")
+    for phase in order:
+        times = phases.get(phase)
+        if not times:
+            continue
+        print(f"{indent}{PROFILE_LABELS.get(phase, phase):28} {len(times):6} {percentile(times, 50):8.3f} "
+              f"{percentile(times, 95):8.3f} {max(times):8.3f} {sum(times):10.1f}")
+
+def profile_report(profile_file=PROFILE_FILE, run=None):
+    """Resume una ejecución perfilada con --profile (por defecto la última):
+    tiempos por fase en total, por liga y por worker"""
+    records = load_profile(profile_file)
+    if not records:
+        print(f"❌ No hay datos de perfilado en {profile_file} (ejecuta antes con --profile)")
+        return
+    run = run or records[-1]['run']
+    records = [record for record in records if record.get('run') == run]
+    if not records:
+        print(f"❌ No hay ninguna ejecución {run} en {profile_file}")
+        return
+    matches = [record for record in records if record.get('kind') == 'match']
+
+    print("="*80)
+    print(f"PERFIL DE LA EJECUCIÓN {run}")
+    print("="*80)
+    ok = sum(1 for record in matches if record['status'] == 'ok')
+    sizes = [record['bytes'] for record in matches if record.get('bytes')]
+    print(f"\n{len(matches)} partidos ({ok} bien, {len(matches) - ok} con error)", end="")
+    if sizes:
+        print(f" — página p50 {percentile(sizes, 50) / 1024:.0f} KB, p95 {percentile(sizes, 95) / 1024:.0f} KB")
+    else:
+        print()
+
+    print("\n📊 Todas las ligas:")
+    print_phase_table(records)
+
+    for league in sorted({record['league'] for record in records}):
+        print(f"\n📊 {league}:")
+        print_phase_table([record for record in records if record['league'] == league])
 
-def extract_all_data(league_config, limit=None, workers=None):
-    """Extrae datos de todos los partidos en paralelo"""
+    workers = sorted({record['worker'] for record in matches if record.get('worker') is not None})
+    if workers:
+        print("\n👷 Por worker:")
+        print(f"   {'worker':>6} {'partidos':>9} {'errores':>8} {'navegador p50':>14} {'p95':>8} {'máx':>8}")
+        for worker in workers:
+            own = [record for record in matches if record.get('worker') == worker]
+            fetch = [record['phases']['fetch'] for record in own if 'fetch' in record['phases']] or [0.0]
+            errors = sum(1 for record in own if record['status'] != 'ok')
+            print(f"   {worker:>6} {len(own):9} {errors:8} {percentile(fetch, 50):14.2f} "
+                  f"{percentile(fetch, 95):8.2f} {max(fetch):8.2f}")
+
+def prepare_league_job(league_config, limit=None, incremental=False, resume=False, discard_journal=False):
+    """Prepara la extracción de datos de una liga: lee sus URLs y decide qué
+    partidos quedan pendientes.
+
+    Con incremental=True solo se procesan los partidos cuyo ID_PARTIDO aún no
+    está en la BBDD, y las filas nuevas se añaden a las existentes.
+
+    Cada partido terminado se apunta en el journal de la liga/temporada y se
+    escribe en la BBDD con el BBDDWriter del trabajo. Con resume=True se
+    reutiliza el journal de una ejecución interrumpida: sus partidos no se
+    vuelven a extraer y entran en el CSV final. Si hay un journal y no se
+    reanuda, la liga no se extrae salvo con discard_journal=True (que lo borra).
+
+    Devuelve el trabajo {'config', 'tasks', 'writer', 'journal_file'}
+    o None si no hay nada que hacer.
+    """
     print("="*80)
     print(f"EXTRAYENDO DATOS DE TODOS LOS PARTIDOS (PARALELO) - {league_config['name']} {league_config['season']}")
     print("="*80)
@@ -636,81 +3306,80 @@ def extract_all_data(league_config, limit=None, workers=None):
         print("   Ejecuta primero: python3 scraper.py urls --league <league>")
         return
 
+    # (indice_original, url): el índice es la posición en el archivo de URLs,
+    # así 'Aux' no cambia aunque se salten partidos ya extraídos
+    tasks = [(j + 1, url) for j, url in enumerate(urls)]
+
+    done_ids = set()
+    if incremental:
+        done_ids = {row.get('ID_PARTIDO') for row in iter_csv(league_config['csv_file'])}
+        tasks = [(j, url) for j, url in tasks if match_id_from_url(url) not in done_ids]
+        print(f"\nModo incremental: {len(urls) - len(tasks)} partidos ya en la BBDD, "
+              f"{len(tasks)} pendientes")
+
+    journal_file = league_config['journal_file']
+    journal = {}
+    if resume:
+        close_journal_tail(journal_file)
+        journal = load_journal(journal_file)
+        tasks = [(j, url) for j, url in tasks if match_id_from_url(url) not in journal]
+        print(f"\nReanudando: {len(journal)} partidos recuperados del journal, "
+              f"{len(tasks)} pendientes")
+    elif os.path.exists(journal_file):
+        # Journal de una ejecución que no terminó: no se tira sin pedirlo
+        if not discard_journal:
+            print(f"\n❌ Hay un journal de una ejecución sin terminar: {journal_file}")
+            print("   Reanúdala con --resume o empieza de cero con --discard-journal")
+            return
+        print(f"\n⚠️ Se descarta el journal previo {journal_file}")
+        os.remove(journal_file)
+
+    # Partidos que según el índice del calendario aún no se han jugado: no se
+    # abren ahora y se vuelven a comprobar en la siguiente ejecución
+    fixtures = load_fixtures(league_config['fixtures_file'])
+    skipped = {}
+    pending_tasks = []
+    for j, url in tasks:
+        reason = fixture_pending_reason(fixtures.get(match_id_from_url(url)))
+        if reason:
+            skipped[reason] = skipped.get(reason, 0) + 1
+        else:
+            pending_tasks.append((j, url))
+    tasks = pending_tasks
+    if skipped:
+        detail = ', '.join(f"{count} {reason}" for reason, count in skipped.items())
+        print(f"\n⏭️ Se saltan {sum(skipped.values())} partidos ({detail}); "
+              f"se volverán a comprobar en la próxima ejecución")
+
     if limit:
-        urls = urls[:limit]
+        tasks = tasks[:limit]
 
-    total_urls = len(urls)
-    if total_urls == 0:
-        print(f"\n⚠️ No hay partidos que procesar para {league_config['name']} {league_config['season']}.\n")
+    total_urls = len(tasks)
+    if total_urls == 0 and not journal:
+        if incremental and done_ids:
+            print(f"\n✓ {league_config['name']} {league_config['season']} ya está al día.\n")
+        else:
+            print(f"\n⚠️ No hay partidos que procesar para {league_config['name']} {league_config['season']}.\n")
         return
     print(f"\nTotal de partidos: {total_urls}\n")
 
-    # Configuración de paralelismo
-    if workers:
-        max_workers = workers
-    else:
-        # Usamos hasta 8 workers si es posible
-        max_workers = min(8, total_urls)
-    
-    if max_workers < 1: max_workers = 1
-    
-    # Dividir URLs en lotes
-    batch_size = math.ceil(total_urls / max_workers)
-    batches = []
-    
-    for i in range(max_workers):
-        start_idx = i * batch_size
-        end_idx = min((i + 1) * batch_size, total_urls)
-        if start_idx >= total_urls:
-            break
-            
-        # Crear lista de tuplas (indice_original, url)
-        batch_urls = []
-        for j in range(start_idx, end_idx):
-            batch_urls.append((j + 1, urls[j]))
-            
-        batches.append((i + 1, batch_urls))
+    # Los partidos recuperados del journal se escriben ya; los demás según terminen
+    writer = BBDDWriter(league_config['csv_file'], league_config['key'], copy_existing=incremental)
+    for record in journal.values():
+        writer.add_match(record['aux'], record['players'])
+
+    return {'config': league_config, 'tasks': tasks, 'writer': writer, 'journal_file': journal_file}
+
+def finish_league_job(job, all_failed):
+    """Cierra la BBDD de una liga (ver BBDDWriter) y muestra el resumen"""
+    league_config = job['config']
+    writer = job['writer']
+    journal_file = job['journal_file']
+
+    print("\n" + "#"*80)
+    print(f"# COMPLETADA: {league_config['name'].upper()} {league_config['season']}")
+    print("#"*80)
 
-    print(f"Iniciando {len(batches)} workers para procesar {total_urls} partidos...\n")
-    
-    all_data = []
-    all_failed = []
-    
-    # Crear contador compartido y lock para el progreso
-    manager = multiprocessing.Manager()
-    progress_counter = manager.Value('i', 0)
-    progress_lock = manager.Lock()
-    
-    # Ejecutar en paralelo con barra de progreso
-    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
-        # Enviar trabajos
-        future_to_batch = {executor.submit(process_batch, batch, progress_counter, progress_lock): batch 
-                          for batch in batches}
-        
-        # Monitorear progreso con tqdm
-        with tqdm(total=total_urls, desc="Extrayendo partidos", unit="partido", 
-                  bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]') as pbar:
-            
-            # Actualizar barra mientras los trabajos se completan
-            while progress_counter.value < total_urls and not all(f.done() for f in future_to_batch):
-                current = progress_counter.value
-                pbar.n = current
-                pbar.refresh()
-                time.sleep(0.1)
-                
-            # Recoger resultados
-            for future in concurrent.futures.as_completed(future_to_batch):
-                try:
-                    data, failed = future.result()
-                    all_data.extend(data)
-                    all_failed.extend(failed)
-                except Exception as exc:
-                    print(f'\n❌ Generó una excepción: {exc}')
-            
-            # Asegurar que la barra llegue a 100%
-            pbar.n = total_urls
-            pbar.refresh()
-    
     # Mostrar resumen de errores si los hay
     if all_failed:
         print(f"\n⚠️ {len(all_failed)} partidos fallidos. Ver logs/scraper_errors.log para detalles.")
@@ -718,112 +3387,381 @@ def extract_all_data(league_config, limit=None, workers=None):
     # Guardar datos finales
     print("\n" + "="*80)
     print("💾 Guardando datos finales...")
-    save_csv(all_data, league_config['csv_file'])
-    print(f"✓ {len(all_data)} registros guardados")
+    writer.close()
+    write_profile({'kind': 'save_csv', 'league': league_config['key'], 'season': league_config['season'],
+                   'rows': writer.existing + writer.written, 'phases': {'save_csv': round(writer.seconds, 4)}})
+    if writer.existing:
+        print(f"✓ {writer.written} registros nuevos ({writer.existing + writer.written} en total)")
+    else:
+        print(f"✓ {writer.written} registros guardados")
     print(f"✓ Archivo: {league_config['csv_file']}")
+    summary = build_match_summary(iter_csv(league_config['csv_file'])) if writer.written else []
+    if summary and league_config.get('summary_file'):
+        save_match_summary(summary, league_config['summary_file'])
+        print(f"✓ Resumen por partido: {league_config['summary_file']}")
+    if os.path.exists(league_config.get('metrics_file', '')):
+        print(f"📊 Métricas: {league_config['metrics_file']}")
     print("="*80 + "\n")
-    
-    # Generar resumen de partidos por fecha
+
+    # El CSV ya contiene todo lo del journal: la próxima ejecución empieza limpia
+    if os.path.exists(journal_file):
+        os.remove(journal_file)
+
+    # En pantalla solo los partidos de esta ejecución
+    if writer.existing:
+        summary = [match for match in summary if match['ID_PARTIDO'] in writer.ids]
+    print_match_summary(summary)
+
+SUMMARY_FIELDS = ['Aux', 'ID_PARTIDO', 'Fecha', 'Equipo_local', 'Equipo_Visitante', 'Jugadores', 'Avisos']
+
+def build_match_summary(rows):
+    """Resumen por partido de las filas de jugadores, en una sola pasada.
+
+    Devuelve [{'Aux', 'ID_PARTIDO', 'Fecha', 'Equipo_local', 'Equipo_Visitante',
+    'Jugadores', 'Avisos', 'date'}] ordenado por Aux, con date = fecha ISO
+    (parse_match_date) o None y Avisos = lo que le falta al partido.
+    """
+    matches = {}
+    for record in rows:
+        key = record.get('ID_PARTIDO') or (record.get('Aux'), record.get('Fecha'))
+        match = matches.get(key)
+        if match is None:
+            match = matches[key] = {
+                'Aux': record.get('Aux', 0),
+                'ID_PARTIDO': record.get('ID_PARTIDO', ''),
+                'Fecha': record.get('Fecha') or '',
+                'Equipo_local': record.get('Equipo_local') or '',
+                'Equipo_Visitante': record.get('Equipo_Visitante') or '',
+                'Jugadores': 0,
+            }
+        match['Jugadores'] += 1
+
+    summary = []
+    for match in matches.values():
+        warnings = []
+        if not match['Equipo_local']:
+            warnings.append('sin equipo local')
+        if not match['Equipo_Visitante']:
+            warnings.append('sin equipo visitante')
+        if not match['Fecha']:
+            warnings.append('sin fecha')
+        match['Avisos'] = ', '.join(warnings)
+        match['date'] = parse_match_date(match['Fecha'])
+        summary.append(match)
+    summary.sort(key=lambda match: int(match['Aux'] or 0))
+    return summary
+
+def save_match_summary(summary, filename):
+    """Guarda el resumen por partido (build_match_summary) junto a la BBDD"""
+    if not summary:
+        return
+    ensure_parent_dir(filename)
+    with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=SUMMARY_FIELDS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(summary)
+
+def print_match_summary(summary):
+    """Muestra los partidos de un resumen (build_match_summary) agrupados por fecha"""
     print("\n" + "="*80)
     print("RESUMEN DE PARTIDOS PROCESADOS")
     print("="*80 + "\n")
-    
-    # Agrupar partidos por fecha
-    from collections import defaultdict
-    from datetime import datetime
-    
-    partidos_por_fecha = defaultdict(list)
-    
-    for record in all_data:
-        fecha = record.get('Fecha', 'Sin fecha')
-        aux = record.get('Aux', 0)
-        local = record.get('Equipo_local', '')
-        visitante = record.get('Equipo_Visitante', '')
-        
-        # Crear clave única para cada partido
-        partido_key = (aux, fecha, local, visitante)
-        
-        if partido_key not in [p[0] for p in partidos_por_fecha[fecha]]:
-            partidos_por_fecha[fecha].append((partido_key, 0))
-    
-    # Contar jugadores por partido
-    for record in all_data:
-        fecha = record.get('Fecha', 'Sin fecha')
-        aux = record.get('Aux', 0)
-        local = record.get('Equipo_local', '')
-        visitante = record.get('Equipo_Visitante', '')
-        partido_key = (aux, fecha, local, visitante)
-        
-        for i, (pk, count) in enumerate(partidos_por_fecha[fecha]):
-            if pk == partido_key:
-                partidos_por_fecha[fecha][i] = (pk, count + 1)
-                break
-    
-    # Ordenar fechas (más reciente primero)
-    def parse_date(date_str):
-        # Intentar varios formatos de fecha
-        formats = [
-            '%d %b %Y',      # 15 Aug 2025
-            '%d %B %Y',      # 15 August 2025
-        ]
-        
-        for fmt in formats:
-            try:
-                return datetime.strptime(date_str, fmt)
-            except:
-                continue
-        
-        # Si ninguno funciona, intentar con replace para normalizar
-        try:
-            # Normalizar "Sept" a "Sep"
-            normalized = date_str.replace('Sept', 'Sep')
-            return datetime.strptime(normalized, '%d %b %Y')
-        except:
-            # Último intento: imprimir para debug y retornar min
-            print(f"⚠️ No se pudo parsear fecha: '{date_str}'")
-            return datetime.min
-    
-    fechas_ordenadas = sorted(partidos_por_fecha.keys(), key=parse_date, reverse=True)
-    
-    # Mostrar resumen
-    for fecha in fechas_ordenadas:
+
+    # Más reciente primero; los partidos sin fecha reconocible, al final
+    by_date = {}
+    for match in summary:
+        by_date.setdefault((match['date'] or '', match['Fecha'] or 'Sin fecha'), []).append(match)
+
+    for (_, fecha), matches in sorted(by_date.items(), reverse=True):
         print(f"\n📅 {fecha}")
         print("-" * 60)
-        
-        # Ordenar partidos por número (Aux)
-        partidos = sorted(partidos_por_fecha[fecha], key=lambda x: x[0][0])
-        
-        for partido_key, num_jugadores in partidos:
-            aux, _, local, visitante = partido_key
+        for match in matches:
+            local = match['Equipo_local']
+            visitante = match['Equipo_Visitante']
             # Acortar nombres de equipos si son muy largos
             if len(local) > 20:
                 local = local[:17] + "..."
             if len(visitante) > 20:
                 visitante = visitante[:17] + "..."
-            print(f"  {local:25} vs  {visitante:25} ({num_jugadores} jugadores)")
-    
+            warning = f"  ⚠️ {match['Avisos']}" if match['Avisos'] else ""
+            print(f"  {local:25} vs  {visitante:25} ({match['Jugadores']} jugadores){warning}")
+
+    incomplete = sum(1 for match in summary if match['Avisos'])
+    if incomplete:
+        print(f"\n⚠️ {incomplete} partidos con datos incompletos (ver la columna Avisos del resumen)")
     print("\n" + "="*80)
 
-def save_csv(data, filename):
-    """Guarda datos en CSV"""
-    if not data:
+def extract_leagues_data(league_configs, limit=None, workers=None, incremental=False, resume=False,
+                         parsers=0, options=None, adaptive=False, discard_journal=False):
+    """Extrae los datos de varias ligas con un único pool de workers.
+
+    Los partidos de todas las ligas van a la misma cola y el CSV de cada liga
+    se escribe en cuanto termina su último partido. Con parsers > 0 el parseo
+    va en procesos aparte; options son las opciones de extracción de los
+    workers (ver run_match_queue y EXTRACTION_DEFAULTS). Con adaptive el número
+    de workers se ajusta solo (workers es el máximo).
+    """
+    jobs = []
+    for league_config in league_configs:
+        job = prepare_league_job(league_config, limit=limit, incremental=incremental, resume=resume,
+                                 discard_journal=discard_journal)
+        if job:
+            jobs.append(job)
+    if not jobs:
         return
 
-    all_keys = set()
-    for record in data:
-        all_keys.update(record.keys())
+    try:
+        run_match_queue(jobs, workers, on_job_done=finish_league_job, parsers=parsers,
+                        options=options, adaptive=adaptive)
+    except KeyboardInterrupt:
+        print("\n⏸️ Interrumpido. Los partidos terminados están en los journals:")
+        for job in jobs:
+            job['writer'].discard()
+            print(f"   {job['journal_file']}")
+        print("   Reanuda con --resume")
+        raise
+
+def extract_all_data(league_config, limit=None, workers=None, incremental=False, resume=False,
+                     parsers=0, options=None, adaptive=False, discard_journal=False):
+    """Extrae datos de todos los partidos de una liga en paralelo"""
+    extract_leagues_data([league_config], limit=limit, workers=workers,
+                         incremental=incremental, resume=resume, parsers=parsers,
+                         options=options, adaptive=adaptive, discard_journal=discard_journal)
+
+def _reparse_entry(entry, parser='bs4'):
+    """Reprocesa un partido del archivo raw (se ejecuta en el pool de reparse)"""
+    try:
+        result = parse_match_page(load_raw_page(entry['sha256']), entry['url'], entry['aux'], parser)
+        return entry, result['players'], None
+    except Exception as e:
+        return entry, [], f"{type(e).__name__}: {str(e)}"
 
-    priority_fields = ['Aux', 'Fecha', 'Jornada', 'ID_PARTIDO', 'Arbitro', 'Equipo_local',
-                      'Equipo_Visitante', 'Jugador']
+def reparse_league(league_config, workers=None, parser='bs4'):
+    """Reconstruye la BBDD de una liga desde el archivo raw, sin navegador.
 
-    fieldnames = [f for f in priority_fields if f in all_keys]
-    fieldnames.extend(sorted([k for k in all_keys if k not in priority_fields]))
+    Cada partido archivado se vuelve a parsear con parse_match_page (backend
+    parser) en un pool de procesos (por defecto uno por núcleo).
+    """
+    print("="*80)
+    print(f"REPROCESANDO DESDE EL ARCHIVO RAW - {league_config['name']} {league_config['season']}")
+    print("="*80)
 
-    ensure_parent_dir(filename)
-    with open(filename, 'w', newline='', encoding='utf-8-sig') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(data)
+    entries = load_jsonl(league_config['raw_index_file'])
+    if not entries:
+        print(f"❌ No hay páginas archivadas para {league_config['name']} {league_config['season']}")
+        print("   Archívalas con: python3 scraper.py data --league <league> --archive-raw")
+        return
+
+    try:
+        with open(league_config['urls_file'], 'r') as f:
+            known = {match_id_from_url(line.strip()) for line in f if line.strip()}
+        missing = len(known - set(entries))
+        if missing:
+            print(f"\n⚠️ {missing} partidos de {league_config['urls_file']} no están archivados "
+                  "y no entrarán en la BBDD")
+    except FileNotFoundError:
+        pass
+
+    max_workers = workers or os.cpu_count() or 1
+    print(f"\nReprocesando {len(entries)} partidos con {max_workers} procesos...\n")
+
+    extract_match_data.quiet_mode = True
+    writer = BBDDWriter(league_config['csv_file'], league_config['key'])
+    failed = []
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+        entries_list = list(entries.values())
+        for entry, players, error in tqdm(executor.map(_reparse_entry, entries_list,
+                                                       [parser] * len(entries_list), chunksize=4),
+                                          total=len(entries), desc="Reprocesando", unit="partido"):
+            if error:
+                failed.append((entry['aux'], entry['url'], error))
+                log_match_error(entry['aux'], entry['url'], error)
+            else:
+                writer.add_match(entry['aux'], players)
+    writer.close()
+
+    if failed:
+        print(f"\n⚠️ {len(failed)} partidos fallidos. Ver logs/scraper_errors.log para detalles.")
+
+    print(f"\n✓ {writer.written} registros guardados en {league_config['csv_file']}")
+    summary = build_match_summary(iter_csv(league_config['csv_file'])) if writer.written else []
+    if summary:
+        save_match_summary(summary, league_config['summary_file'])
+        print(f"✓ Resumen por partido: {league_config['summary_file']}")
+    print_match_summary(summary)
+
+# ---------------------------------------------------------------------------
+# BBDD en CSV
+#
+# Las columnas de estadísticas de cada competición salen de un esquema guardado
+# en cache/opta_stat_schema.json: se aprende la primera vez (de la BBDD que ya
+# haya o de las tablas del primer partido) y después solo crece, con las
+# estadísticas nuevas al final. Así las columnas no cambian de una ejecución a
+# otra aunque en algún partido falte una estadística, y las filas se pueden
+# escribir según terminan los partidos sin tener la temporada en memoria.
+# ---------------------------------------------------------------------------
+
+# Columnas fijas de cada fila, delante de las estadísticas
+BASE_FIELDS = ['Aux', 'Fecha', 'Jornada', 'ID_PARTIDO', 'Arbitro', 'Equipo_local',
+               'Equipo_Visitante', 'Jugador']
+
+def load_stat_schemas():
+    """Esquemas {liga: {'stats': [...], 'updated'}} (vacío si no existe)"""
+    try:
+        with open(STAT_SCHEMA_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_stat_schema(league_key, stats):
+    schemas = load_stat_schemas()
+    schemas[league_key] = {'stats': stats, 'updated': datetime.now().isoformat(timespec='seconds')}
+    ensure_parent_dir(STAT_SCHEMA_FILE)
+    tmp_file = STAT_SCHEMA_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(schemas, f, indent=1, ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_file, STAT_SCHEMA_FILE)
+
+def iter_csv(filename):
+    """Filas de una BBDD ya generada, una a una (ninguna si no existe)"""
+    if not os.path.exists(filename):
+        return
+    with open(filename, 'r', newline='', encoding='utf-8-sig') as csvfile:
+        yield from csv.DictReader(csvfile)
+
+def load_csv(filename):
+    """Lee una BBDD ya generada como lista de dicts ([] si no existe)"""
+    return list(iter_csv(filename))
+
+def csv_header(filename):
+    """Columnas de una BBDD ya generada ([] si no existe)"""
+    if not os.path.exists(filename):
+        return []
+    with open(filename, 'r', newline='', encoding='utf-8-sig') as csvfile:
+        return next(csv.reader(csvfile), [])
+
+class BBDDWriter:
+    """Escribe la BBDD de una liga según van terminando sus partidos.
+
+    Las filas se escriben en <csv>.tmp en el orden en que llegan (add_match),
+    apuntando dónde empieza y acaba cada partido en el archivo; close() lo
+    copia en orden de Aux sobre la BBDD, tramo a tramo, así en memoria solo
+    están esas posiciones. Con copy_existing=True (modo incremental) se copia
+    antes, partido a partido, la BBDD actual, que va delante de lo nuevo.
+    """
+
+    def __init__(self, filename, league_key, copy_existing=False):
+        self.filename = filename
+        self.tmp_file = filename + '.tmp'
+        self.league_key = league_key
+        self.copy_existing = copy_existing
+        self.stats = None
+        self.columns = set()
+        self.file = None
+        self.writer = None
+        self.segments = []  # (orden, inicio, fin): bytes de cada partido en el .tmp
+        self.existing = 0
+        self.written = 0
+        self.ids = set()
+        self.seconds = 0.0  # tiempo escribiendo (perfilado de save_csv)
+
+    def add_match(self, aux, players):
+        """Escribe las filas de un partido terminado"""
+        if not players:
+            return
+        start = time.perf_counter()
+        if self.file is None:
+            self._open(players)
+        self._write((1, aux), players)
+        self.written += len(players)
+        self.ids.update(row.get('ID_PARTIDO') for row in players)
+        self.seconds += time.perf_counter() - start
+
+    def close(self):
+        """Sustituye la BBDD por lo escrito, en orden de Aux. Si no se ha
+        escrito nada la BBDD anterior se deja como está."""
+        if self.file is None:
+            return
+        start = time.perf_counter()
+        self.file.close()
+        self.file = None
+        if self.segments == sorted(self.segments):
+            os.replace(self.tmp_file, self.filename)
+        else:
+            sorted_file = self.tmp_file + '.sorted'
+            with open(self.tmp_file, 'rb') as src, open(sorted_file, 'wb') as dst:
+                # Cabecera (con el BOM) y después cada partido en su sitio
+                dst.write(src.read(self.segments[0][1]))
+                for _, begin, end in sorted(self.segments):
+                    src.seek(begin)
+                    dst.write(src.read(end - begin))
+            os.replace(sorted_file, self.filename)
+            os.remove(self.tmp_file)
+        self.seconds += time.perf_counter() - start
+
+    def discard(self):
+        """Abandona lo escrito (liga sin terminar): la BBDD anterior no se toca"""
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        if os.path.exists(self.tmp_file):
+            os.remove(self.tmp_file)
+
+    def _open(self, players):
+        stats = load_stat_schemas().get(self.league_key, {}).get('stats')
+        if stats is None:
+            # Primera vez: de la BBDD existente o, si no hay, del primer partido
+            header = csv_header(self.filename) if self.copy_existing else []
+            stats = ([column for column in header if column not in BASE_FIELDS]
+                     or sorted({key for row in players for key in row} - set(BASE_FIELDS)))
+            save_stat_schema(self.league_key, stats)
+        self.stats = list(stats)
+        self.columns = set(BASE_FIELDS + self.stats)
+        ensure_parent_dir(self.tmp_file)
+        self.file = open(self.tmp_file, 'w', newline='', encoding='utf-8-sig')
+        self.writer = csv.DictWriter(self.file, fieldnames=BASE_FIELDS + self.stats, restval='')
+        self.writer.writeheader()
+        if self.copy_existing:
+            for n, (_, rows) in enumerate(itertools.groupby(iter_csv(self.filename),
+                                                            key=lambda row: row.get('ID_PARTIDO'))):
+                rows = list(rows)
+                self._write((0, n), rows)
+                self.existing += len(rows)
+
+    def _write(self, order, rows):
+        new_stats = sorted({key for row in rows for key in row if key not in self.columns})
+        if new_stats:
+            self._extend(new_stats)
+        begin = self.file.tell()
+        self.writer.writerows(rows)
+        self.file.flush()
+        self.segments.append((order, begin, self.file.tell()))
+
+    def _extend(self, new_stats):
+        """Añade estadísticas nuevas al final del esquema y reescribe el .tmp
+        tramo a tramo (las filas ya escritas quedan con esas columnas vacías)"""
+        self.stats.extend(new_stats)
+        self.columns.update(new_stats)
+        save_stat_schema(self.league_key, self.stats)
+        tqdm.write(f"🆕 Nuevas estadísticas en {self.league_key}: {', '.join(new_stats)}")
+
+        self.file.close()
+        rewritten = self.tmp_file + '.new'
+        padding = [''] * len(new_stats)
+        segments = []
+        with open(self.tmp_file, 'rb') as src, open(rewritten, 'w', newline='', encoding='utf-8-sig') as dst:
+            writer = csv.writer(dst)
+            writer.writerow(BASE_FIELDS + self.stats)
+            for order, begin, end in self.segments:
+                src.seek(begin)
+                text = src.read(end - begin).decode('utf-8')
+                start = dst.tell()
+                writer.writerows(row + padding for row in csv.reader(io.StringIO(text, newline='')))
+                segments.append((order, start, dst.tell()))
+        os.replace(rewritten, self.tmp_file)
+        self.segments = segments
+        self.file = open(self.tmp_file, 'a', newline='', encoding='utf-8')
+        self.writer = csv.DictWriter(self.file, fieldnames=BASE_FIELDS + self.stats, restval='')
 
 def show_seasons(league_keys):
     """Lista las temporadas disponibles de cada competición"""
@@ -839,17 +3777,97 @@ def show_seasons(league_keys):
 
 def main():
     parser = argparse.ArgumentParser(description='Scraper de datos de partidos')
-    parser.add_argument('command', choices=['urls', 'data', 'all', 'seasons'],
-                       help='Comando a ejecutar (seasons lista las temporadas disponibles)')
+    parser.add_argument('command', choices=['urls', 'data', 'all', 'seasons', 'reparse', 'profile'],
+                       help='Comando a ejecutar (seasons lista las temporadas disponibles, '
+                            'reparse reconstruye la BBDD desde el archivo raw sin navegador, '
+                            'profile resume la última ejecución con --profile)')
     parser.add_argument('--league', type=str, default='spain', 
                        choices=ALL_LEAGUES + ['both', 'all'],
                        help='Liga/Competición: spain, england, germany, italy, france, ucl, uel, spain2, both (spain+england), o all (todas)')
     parser.add_argument('--season', type=normalize_season, default=None,
                        help=f'Temporada, p.ej. 2026-2027 (por defecto la temporada en curso: {current_season()})')
     parser.add_argument('--limit', type=int, help='Limitar número de partidos (para pruebas)')
-    parser.add_argument('--workers', type=int, help='Número de workers en paralelo')
+    parser.add_argument('--workers', type=int, help='Número de workers en paralelo (con --adaptive, el máximo)')
+    parser.add_argument('--adaptive', action='store_true',
+                       help='Ajusta el número de workers sobre la marcha según latencia, timeouts, CPU y memoria')
+    parser.add_argument('--parsers', type=int, default=None,
+                       help=f'Procesos de parseo separados de los navegadores; 0 = cada worker '
+                            f'parsea sus páginas (por defecto {DEFAULT_PARSERS}; 0 con --extract js/feed)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reanuda una extracción interrumpida desde su journal')
+    parser.add_argument('--discard-journal', action='store_true',
+                       help='Borra el journal de una extracción interrumpida y empieza de cero')
+    parser.add_argument('--archive-raw', action='store_true',
+                       help='Guarda el HTML de cada partido en data/opta/raw/ (para reparse)')
+    parser.add_argument('--parser', choices=sorted(PAGE_BACKENDS), default=EXTRACTION_DEFAULTS['parser'],
+                       help='Backend de parseo del HTML: bs4 (html.parser) o lxml (más rápido, mismas filas)')
+    parser.add_argument('--extract', choices=['html', 'js', 'feed'], default=EXTRACTION_DEFAULTS['extract'],
+                       help='html: se descarga el DOM completo y se parsea en Python; js: los datos '
+                            'se extraen dentro del navegador con un único execute_script; feed: se lee '
+                            'el feed de Opta del log de red de Chrome (si no llega, como js)')
+    parser.add_argument('--tabs', type=int, default=EXTRACTION_DEFAULTS['tabs'],
+                       help='Partidos cargándose a la vez en cada Chrome, cada uno en su pestaña '
+                            '(por defecto %(default)s; con Selenium no es compatible con --extract feed)')
+    parser.add_argument('--http-first', action='store_true',
+                       help='Prueba cada partido con una petición HTTP sin navegador (página o feed de '
+                            'Opta) y solo abre Chrome si no trae jugadores')
+    parser.add_argument('--feed-url', metavar='PLANTILLA',
+                       help='URL del feed matchstats con {match_id} para --http-first (por defecto la '
+                            'aprendida con --extract feed y guardada en cache/opta_feed_url.json)')
+    parser.add_argument('--backend', choices=['selenium', 'playwright'], default=EXTRACTION_DEFAULTS['backend'],
+                       help='Navegador de la fase de datos: selenium (un proceso por Chrome) o playwright '
+                            '(asyncio; cada worker es un Chromium con --tabs páginas a la vez)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Solo extrae los partidos que aún no están en la BBDD y los añade a ella')
+    parser.add_argument('--delta', action='store_true',
+                       help='Búsqueda de URLs incremental: solo añade los partidos nuevos a match_urls')
+    parser.add_argument('--block', default=','.join(BLOCKING_DEFAULTS['types']),
+                       help=f"Tipos de recurso que no se descargan, separados por comas "
+                            f"({', '.join(BLOCKED_RESOURCE_PATTERNS)}) o 'none' para no bloquear nada "
+                            f"(ni siquiera publicidad/analítica). Por defecto: %(default)s")
+    parser.add_argument('--block-url', action='append', default=[], metavar='PATRÓN',
+                       help='Patrón de URL extra a bloquear (comodín *), se puede repetir')
+    parser.add_argument('--no-disk-cache', action='store_true',
+                       help='No usar la caché HTTP persistente de cada Chrome (cache/chrome/)')
+    parser.add_argument('--recycle-pages', type=int, default=100,
+                       help='Reinicia el Chrome de cada worker tras N partidos; 0 = nunca (por defecto %(default)s)')
+    parser.add_argument('--max-rss', type=int, default=1500, metavar='MB',
+                       help='Reinicia el Chrome de un worker si su memoria pasa de MB; 0 = sin límite '
+                            '(por defecto %(default)s)')
+    parser.add_argument('--retries', type=int, default=EXTRACTION_DEFAULTS['retries'],
+                       help='Reintentos de los partidos con fallos transitorios (por defecto %(default)s)')
+    parser.add_argument('--retry-backoff', type=float, default=EXTRACTION_DEFAULTS['retry_backoff'],
+                       help='Segundos antes del primer reintento, se duplica en cada uno (por defecto %(default)s)')
+    parser.add_argument('--profile', action='store_true',
+                       help='Guarda el tiempo de cada fase de cada partido en logs/profile.jsonl '
+                            '(ver el comando profile)')
+    parser.add_argument('--run', help='Ejecución que resume el comando profile (por defecto la última)')
+    parser.add_argument('--wait-page', type=float, default=READINESS_DEFAULTS['page'],
+                       help='Máximo de segundos esperando a que la red quede inactiva al abrir el calendario')
+    parser.add_argument('--wait-scroll', type=float, default=READINESS_DEFAULTS['scroll'],
+                       help='Máximo de segundos esperando nuevos partidos tras cada scroll')
+    parser.add_argument('--wait-rows', type=float, default=READINESS_DEFAULTS['rows'],
+                       help='Máximo de segundos esperando a que se estabilicen las filas de jugadores')
     
     args = parser.parse_args()
+    if args.extract != 'html' and args.archive_raw:
+        parser.error('--archive-raw necesita el HTML completo (--extract html)')
+    if args.tabs < 1:
+        parser.error('--tabs tiene que ser al menos 1')
+    if args.feed_url and '{match_id}' not in args.feed_url:
+        parser.error('--feed-url tiene que llevar {match_id}')
+    if args.backend == 'playwright' and async_playwright is None:
+        parser.error('--backend playwright necesita Playwright (pip install playwright && playwright install chromium)')
+    if args.tabs > 1 and args.extract == 'feed' and args.backend == 'selenium':
+        parser.error('--extract feed no es compatible con --tabs (el log de red es de todo el navegador)')
+    block_types = [] if args.block == 'none' else [t for t in args.block.split(',') if t]
+    unknown_types = set(block_types) - set(BLOCKED_RESOURCE_PATTERNS)
+    if unknown_types:
+        parser.error(f"--block: tipos desconocidos {', '.join(sorted(unknown_types))}")
+    blocking = None if args.block == 'none' and not args.block_url else \
+        {'types': block_types, 'urls': ([] if args.block == 'none' else BLOCKING_DEFAULTS['urls']) + args.block_url}
+    if args.parsers is None:
+        args.parsers = 0 if args.extract != 'html' else DEFAULT_PARSERS
 
     start_time = time.time()
     season = args.season or current_season()
@@ -865,25 +3883,41 @@ def main():
     if args.command == 'seasons':
         show_seasons(leagues_to_process)
         return
+    if args.command == 'profile':
+        profile_report(run=args.run)
+        return
 
     print(f"\n🗓️  Temporada: {season}")
-    
-    # Procesar cada liga
-    for league_key in leagues_to_process:
-        league_config = build_league_config(league_key, season)
-        
-        print("\n" + "#"*80)
-        print(f"# PROCESANDO: {league_config['name'].upper()} {season}")
-        print("#"*80 + "\n")
-        
-        if args.command == 'urls':
-            extract_urls(league_config)
-        elif args.command == 'data':
-            extract_all_data(league_config, limit=args.limit, workers=args.workers)
-        elif args.command == 'all':
-            extract_urls(league_config)
-            extract_all_data(league_config, limit=args.limit, workers=args.workers)
-        
+    if BASE_URL != DEFAULT_BASE_URL:
+        print(f"⚠️ OPTA_BASE_URL: se usa {BASE_URL} en vez de la web de Opta")
+
+    league_configs = [build_league_config(league_key, season) for league_key in leagues_to_process]
+    readiness = {'page': args.wait_page, 'scroll': args.wait_scroll, 'rows': args.wait_rows}
+    options = extraction_options({'archive_raw': args.archive_raw, 'parser': args.parser,
+                                  'extract': args.extract, 'readiness': readiness,
+                                  'blocking': blocking, 'disk_cache': not args.no_disk_cache,
+                                  'recycle_pages': args.recycle_pages, 'max_rss_mb': args.max_rss,
+                                  'retries': args.retries, 'retry_backoff': args.retry_backoff,
+                                  'tabs': args.tabs, 'backend': args.backend,
+                                  'http_first': args.http_first, 'feed_url': args.feed_url,
+                                  'profile': datetime.now().isoformat(timespec='seconds') if args.profile else None})
+    print("\n" + "#"*80)
+    print(f"# PROCESANDO: {', '.join(c['name'].upper() for c in league_configs)} {season}")
+    print("#"*80 + "\n")
+
+    # Con varias ligas, las URLs se buscan en paralelo y todos los partidos
+    # comparten un único pool de workers
+    if args.command in ('urls', 'all'):
+        extract_urls_parallel(league_configs, workers=args.workers, options=options, delta=args.delta)
+    if args.command in ('data', 'all'):
+        extract_leagues_data(league_configs, limit=args.limit, workers=args.workers,
+                             incremental=args.incremental, resume=args.resume,
+                             parsers=args.parsers, options=options, adaptive=args.adaptive,
+                             discard_journal=args.discard_journal)
+    if args.command == 'reparse':
+        for league_config in league_configs:
+            reparse_league(league_config, workers=args.workers, parser=args.parser)
+
     duration = time.time() - start_time
     print(f"\n⏱️ Tiempo total de ejecución: {duration:.2f} segundos")
 